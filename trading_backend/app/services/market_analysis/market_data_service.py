@@ -1,6 +1,6 @@
 """Service for fetching and analyzing market data."""
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import aiohttp
 import asyncio
 import time
@@ -43,6 +43,20 @@ class MarketDataService:
         # If we get here, all retries failed
         raise Exception(f"Failed to fetch market data after {self._retry_count} attempts: {last_error}")
 
+    async def get_market_data_batch(
+        self,
+        symbols: List[str],
+        timeframe: str = "1h",
+        limit: int = 100,
+        testing: bool = False,
+        **kwargs
+    ) -> List[Dict]:
+        """Fetch market data for several symbols concurrently, in symbol order."""
+        return list(await asyncio.gather(*(
+            self.get_market_data(symbol, timeframe, limit, testing, **kwargs)
+            for symbol in symbols
+        )))
+
     async def _check_rate_limit(self):
         """Implement rate limiting logic"""
         now = time.time()
@@ -40,6 +40,19 @@ class AccountMonitor:
             "large": Decimal("0.05")   # 5% of 24h volume
         }
 
+        # Position multipliers indexed by volatility tier
+        self.volatility_multipliers = (
+            Decimal("1.2"),  # Low volatility (< 2%)
+            Decimal("1.0"),  # Normal volatility
+            Decimal("0.7")   # High volatility (> 5%)
+        )
+
+        # Share of the position taken by each of the first two staged entries
+        self.entry_tranche = Decimal("0.3")
+
+        # Maximum share of the account risked on a single trade
+        self.max_account_risk_percentage = Decimal("0.05")
+
     async def get_account_stage(self, balance: Decimal) -> str:
         """
         Determine account stage based on current balance.
@@ -62,7 +75,8 @@ class AccountMonitor:
         balance: Decimal,
         symbol: str,
         risk_percentage: Decimal = Decimal("0.02"),
-        volatility_adjustment: bool = True
+        volatility_adjustment: bool = True,
+        stage: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Calculate recommended position size based on account balance, market conditions,
@@ -73,11 +87,13 @@ class AccountMonitor:
             symbol: Trading pair symbol
             risk_percentage: Base risk percentage (default 2%)
             volatility_adjustment: Whether to adjust for market volatility
+            stage: Optional account stage already resolved for this balance
 
         Returns:
             Dict containing position sizing recommendations and constraints
         """
-        stage = await self.get_account_stage(balance)
+        if stage is None:
+            stage = await self.get_account_stage(balance)
         market_data = await self.market_data_service.get_market_data(symbol)
 
         # Adjust risk based on account stage
@@ -91,13 +107,11 @@ class AccountMonitor:
         max_position = volume_24h * self.max_volume_percentage[stage]
 
         # Adjust for volatility if enabled
-        volatility_multiplier = Decimal("1.0")
+        volatility_multiplier = self.volatility_multipliers[1]
         if volatility_adjustment and "volatility" in market_data:
-            volatility = Decimal(str(market_data["volatility"]))
-            if volatility > Decimal("0.05"):  # High volatility
-                volatility_multiplier = Decimal("0.7")
-            elif volatility < Decimal("0.02"):  # Low volatility
-                volatility_multiplier = Decimal("1.2")
+            volatility = float(market_data["volatility"])
+            tier = (volatility >= 0.02) + (volatility > 0.05)
+            volatility_multiplier = self.volatility_multipliers[tier]
 
         # Calculate final position size
         final_position_size = min(
@@ -108,10 +122,11 @@ class AccountMonitor:
         # For medium and large accounts, calculate staged entries
         entry_stages = None
         if stage in ["medium", "large"]:
+            tranche = final_position_size * self.entry_tranche
             entry_stages = [
-                final_position_size * Decimal("0.3"),  # First entry 30%
-                final_position_size * Decimal("0.3"),  # Second entry 30%
-                final_position_size * Decimal("0.4")   # Final entry 40%
+                tranche,                                      # First entry 30%
+                tranche,                                      # Second entry 30%
+                final_position_size - tranche - tranche       # Final entry 40%
             ]
 
         return {
@@ -153,7 +168,7 @@ class AccountMonitor:
         if position_size > max_position:
             return False, f"Position size exceeds maximum allowed ({float(max_position)} USDT) for market volume"
 
-        max_account_risk = balance * Decimal("0.05")  # Maximum 5% of account per trade
+        max_account_risk = balance * self.max_account_risk_percentage
         if position_size > max_account_risk:
             return False, f"Position size exceeds maximum account risk ({float(max_account_risk)} USDT)"
 
@@ -96,7 +96,8 @@ class PairSelector:
         self,
         symbol: str,
         balance: Decimal,
-        position_size: Optional[Decimal] = None
+        position_size: Optional[Decimal] = None,
+        stage: Optional[str] = None
     ) -> Tuple[bool, str]:
         """
         Validate if a specific trading pair is suitable for the current account balance
@@ -106,11 +107,13 @@ class PairSelector:
             symbol: Trading pair symbol
             balance: Current account balance in USDT
             position_size: Optional position size to validate
+            stage: Optional account stage already resolved for this balance
 
         Returns:
             Tuple of (is_valid: bool, reason: str)
         """
-        stage = await self.account_monitor.get_account_stage(balance)
+        if stage is None:
+            stage = await self.account_monitor.get_account_stage(balance)
         market_data = await self.market_data_service.get_market_data(symbol)
 
         volume_24h = Decimal(str(market_data.get("volume_24h", 0)))
@@ -1,13 +1,38 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from bisect import bisect_right
 from decimal import Decimal
 from datetime import datetime
 from app.services.monitoring.account_monitor import AccountMonitor
 from app.services.trading.pair_selector import PairSelector
 from app.services.market_analysis.market_data_service import MarketDataService
+import numpy as np
+import asyncio
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+# (epoch millisecond, ISO timestamp) of the most recently formatted signal time
+_last_timestamp = (0, "")
+
+
+def _signal_timestamp() -> str:
+    """
+    Current UTC time as an ISO string at millisecond resolution, formatted at
+    most once per millisecond and shared by all signals stamped within it.
+    """
+    global _last_timestamp
+    now_ms = int(time.time() * 1000)
+    cached_ms, cached_timestamp = _last_timestamp
+    if now_ms == cached_ms:
+        return cached_timestamp
+
+    timestamp = datetime.utcfromtimestamp(now_ms / 1000).isoformat(timespec="milliseconds")
+    # A single tuple assignment, so concurrent threads at worst format twice
+    _last_timestamp = (now_ms, timestamp)
+    return timestamp
+
+
 class TradingStrategy:
     """
     Enhanced trading strategy that adapts based on account size and market conditions.
@@ -15,18 +40,47 @@ class TradingStrategy:
     and position sizing strategies.
     """
 
+    # Account stages that split positions into staged entries
+    _STAGED_ENTRY_STAGES = ("medium", "large")
+
+    # Confidence thresholds and the position multiplier for each band:
+    # < 0.85 -> 0.4, >= 0.85 -> 0.6, >= 0.90 -> 0.8, >= 0.95 -> 1.0
+    _CONFIDENCE_THRESHOLDS = (0.85, 0.90, 0.95)
+    _CONFIDENCE_MULTIPLIERS = (0.4, 0.6, 0.8, 1.0)
+
+    # Share of the position taken by each of the first two entries (30% each)
+    _ENTRY_TRANCHE = 0.3
+
+    # Staged entry template:
+    # (stage, volatility factor, order type, long description, short description)
+    _ENTRY_STAGE_TEMPLATE = (
+        (1, 0.0, "market", "Initial entry", "Initial entry"),
+        (2, 0.5, "limit", "First dip buy", "First bounce sell"),
+        (3, 1.0, "limit", "Second dip buy", "Second bounce sell"),
+    )
+    _ENTRY_STAGE_FACTORS = np.array([template[1] for template in _ENTRY_STAGE_TEMPLATE])
+
+    # Below this many pairs the per-pair Python scoring beats ndarray setup
+    _VECTORIZE_MIN_PAIRS = 16
+
     def __init__(
         self,
         account_monitor: AccountMonitor,
         pair_selector: PairSelector,
         market_data_service: MarketDataService,
-        min_accuracy_threshold: float = 0.82
+        min_accuracy_threshold: float = 0.82,
+        market_data_ttl: float = 3.0
     ):
         self.account_monitor = account_monitor
         self.pair_selector = pair_selector
         self.market_data_service = market_data_service
         self.min_accuracy_threshold = min_accuracy_threshold
 
+        # Short-lived market data cache: symbol -> (fetch time, fetch task).
+        # Caching the task lets concurrent callers share one in-flight request.
+        self.market_data_ttl = market_data_ttl
+        self._market_data_cache: Dict[str, Tuple[float, asyncio.Future]] = {}
+
     async def generate_signal(
         self,
         balance: Decimal,
@@ -44,66 +98,155 @@ class TradingStrategy:
             symbol: Trading pair symbol
             signal_type: Type of trading signal (e.g., 'long', 'short')
             confidence: Signal confidence level (0.0 to 1.0)
-            **kwargs: Additional signal parameters
+            **kwargs: Additional signal parameters; pass ``timestamp`` to stamp
+                a batch of signals with one pre-formatted ISO time
 
         Returns:
             Dict containing signal details and position recommendations
         """
+        signal, _ = await self._build_signal(
+            balance, symbol, signal_type, confidence, kwargs, with_entry_conditions=True
+        )
+        return signal
+
+    async def _build_signal(
+        self,
+        balance: Decimal,
+        symbol: str,
+        signal_type: str,
+        confidence: float,
+        kwargs: Dict[str, Any],
+        with_entry_conditions: bool
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Build a signal and return it with the market data it was based on.
+        Staged signals only get entry conditions when with_entry_conditions is
+        set, so batch callers can price all entry stages together.
+        """
         # Skip signals below minimum accuracy threshold
         if confidence < self.min_accuracy_threshold:
             logger.info(f"Signal confidence {confidence} below minimum threshold {self.min_accuracy_threshold}")
-            return None
+            return None, None
+
+        # Resolve the account stage once and share it with the downstream checks
+        stage = await self.account_monitor.get_account_stage(balance)
 
         # Validate trading pair for current account stage
-        is_valid, reason = await self.pair_selector.validate_pair(symbol, balance)
+        is_valid, reason = await self.pair_selector.validate_pair(symbol, balance, stage=stage)
         if not is_valid:
             logger.warning(f"Trading pair validation failed: {reason}")
-            return None
+            return None, None
 
         # Get position sizing recommendation
         position_data = await self.account_monitor.calculate_position_size(
             balance=balance,
             symbol=symbol,
-            volatility_adjustment=True
+            volatility_adjustment=True,
+            stage=stage
         )
 
         # Get market conditions for strategy adaptation
-        market_data = await self.market_data_service.get_market_data(symbol)
+        market_data = await self._get_market_data(symbol)
+        volume_24h = market_data.get("volume_24h")
+        volatility = market_data.get("volatility")
+        trend = market_data.get("trend")
+
+        # Adjust position size based on signal confidence; a zero recommendation
+        # (e.g. no market volume) stays zero without a multiplier lookup
+        recommended_size = position_data["recommended_size"]
+        if recommended_size:
+            adjusted_size = recommended_size * self._calculate_confidence_multiplier(confidence)
+        else:
+            adjusted_size = 0.0
 
-        # Adjust position size based on signal confidence
-        confidence_multiplier = self._calculate_confidence_multiplier(confidence)
-        adjusted_size = Decimal(str(position_data["recommended_size"])) * Decimal(str(confidence_multiplier))
+        timestamp = kwargs.pop("timestamp", None) or _signal_timestamp()
 
         # Build signal response
         signal = {
             "symbol": symbol,
             "signal_type": signal_type,
-            "position_size": float(adjusted_size),
-            "account_stage": position_data["stage"],
+            "position_size": adjusted_size,
+            "account_stage": stage,
             "confidence": confidence,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp,
             "market_conditions": {
-                "volume_24h": market_data.get("volume_24h"),
-                "volatility": market_data.get("volatility"),
-                "trend": market_data.get("trend")
+                "volume_24h": volume_24h,
+                "volatility": volatility,
+                "trend": trend
             },
             **kwargs
         }
 
         # Add staged entry points for medium and large accounts
-        if position_data["stage"] in ["medium", "large"]:
+        if stage in self._STAGED_ENTRY_STAGES:
+            # First and second entries are both 30%; the final 40% is the
+            # remainder, so the stages sum back to the total
+            tranche = adjusted_size * self._ENTRY_TRANCHE
             signal["entry_stages"] = [
-                float(adjusted_size * Decimal("0.3")),  # First entry 30%
-                float(adjusted_size * Decimal("0.3")),  # Second entry 30%
-                float(adjusted_size * Decimal("0.4"))   # Final entry 40%
+                tranche,                           # First entry 30%
+                tranche,                           # Second entry 30%
+                adjusted_size - tranche - tranche  # Final entry 40%
             ]
-            signal["entry_conditions"] = self._generate_entry_conditions(
-                symbol,
-                signal_type,
-                market_data
+            if with_entry_conditions:
+                signal["entry_conditions"] = self._generate_entry_conditions(
+                    symbol,
+                    signal_type,
+                    market_data
+                )
+
+        return signal, market_data
+
+    async def generate_signals(
+        self,
+        requests: List[Dict[str, Any]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Generate trading signals for many symbols concurrently.
+
+        Args:
+            requests: generate_signal keyword arguments per signal, e.g.
+                {"balance": ..., "symbol": ..., "signal_type": ..., "confidence": ...}
+
+        Returns:
+            Signals in request order, with None for rejected requests
+        """
+        # Stamp the whole batch once
+        timestamp = _signal_timestamp()
+
+        built = await asyncio.gather(*(
+            self._build_signal(
+                request["balance"],
+                request["symbol"],
+                request["signal_type"],
+                request["confidence"],
+                {
+                    "timestamp": timestamp,
+                    **{
+                        key: value for key, value in request.items()
+                        if key not in ("balance", "symbol", "signal_type", "confidence")
+                    }
+                },
+                with_entry_conditions=False
             )
+            for request in requests
+        ))
 
-        return signal
+        # Price the entry stages of all staged signals in one array pass
+        staged = [
+            (signal, market_data) for signal, market_data in built
+            if signal is not None and signal["account_stage"] in self._STAGED_ENTRY_STAGES
+        ]
+        if staged:
+            is_long = [signal["signal_type"] == "long" for signal, _ in staged]
+            entry_prices = self._generate_entry_prices_batch(
+                [float(market_data.get("price", 0)) for _, market_data in staged],
+                [float(market_data.get("volatility", 0)) for _, market_data in staged],
+                is_long
+            )
+            for (signal, _), long_entry, prices in zip(staged, is_long, entry_prices.tolist()):
+                signal["entry_conditions"] = self._build_entry_conditions(long_entry, prices)
+
+        return [signal for signal, _ in built]
 
     async def select_trading_pairs(
         self,
@@ -128,30 +271,82 @@ class TradingStrategy:
             base_pairs=base_pairs
         )
 
+        market_datas = await self._get_market_data_many(
+            [pair["symbol"] for pair in suitable_pairs]
+        )
+        confidences = self._calculate_pair_confidences(market_datas)
+
         # Filter pairs based on minimum confidence requirement
         filtered_pairs = []
-        for pair in suitable_pairs:
-            market_data = await self.market_data_service.get_market_data(pair["symbol"])
-            confidence = self._calculate_pair_confidence(market_data)
-
+        for pair, confidence in zip(suitable_pairs, confidences):
             if confidence >= min_confidence:
                 pair["confidence"] = confidence
                 filtered_pairs.append(pair)
 
         return filtered_pairs
 
-    def _calculate_confidence_multiplier(self, confidence: float) -> Decimal:
+    async def _get_market_data(self, symbol: str) -> Dict[str, Any]:
+        """
+        Fetch market data for a symbol, reusing a fetch started within the
+        last market_data_ttl seconds.
+        """
+        now = time.monotonic()
+        cached = self._market_data_cache.get(symbol)
+        if cached is None or now - cached[0] >= self.market_data_ttl:
+            task = asyncio.ensure_future(self.market_data_service.get_market_data(symbol))
+            cached = (now, task)
+            self._market_data_cache[symbol] = cached
+
+        task = cached[1]
+        try:
+            # Shield the shared fetch so one cancelled caller doesn't cancel it
+            # for every other waiter
+            return await asyncio.shield(task)
+        except BaseException:
+            # Don't cache a fetch that failed or was cancelled; the next caller
+            # retries. A caller's own cancellation leaves a running fetch cached.
+            failed = task.done() and (task.cancelled() or task.exception() is not None)
+            if failed and self._market_data_cache.get(symbol) is cached:
+                del self._market_data_cache[symbol]
+            raise
+
+    async def _get_market_data_many(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch market data for several symbols concurrently through the cache,
+        using the service's batch endpoint for symbols not already cached.
+        """
+        get_batch = getattr(self.market_data_service, "get_market_data_batch", None)
+        if get_batch is not None:
+            now = time.monotonic()
+            missing = [
+                symbol for symbol in dict.fromkeys(symbols)
+                if symbol not in self._market_data_cache
+                or now - self._market_data_cache[symbol][0] >= self.market_data_ttl
+            ]
+            if missing:
+                batch = asyncio.ensure_future(get_batch(missing))
+                for index, symbol in enumerate(missing):
+                    self._market_data_cache[symbol] = (
+                        now,
+                        asyncio.ensure_future(self._batch_item(batch, index))
+                    )
+
+        return list(await asyncio.gather(*(
+            self._get_market_data(symbol) for symbol in symbols
+        )))
+
+    @staticmethod
+    async def _batch_item(batch: asyncio.Future, index: int) -> Dict[str, Any]:
+        """Pick one symbol's result out of a batch market data fetch."""
+        return (await batch)[index]
+
+    def _calculate_confidence_multiplier(self, confidence: float) -> float:
         """
         Calculate position size multiplier based on signal confidence.
         """
-        if confidence >= 0.95:
-            return Decimal("1.0")
-        elif confidence >= 0.90:
-            return Decimal("0.8")
-        elif confidence >= 0.85:
-            return Decimal("0.6")
-        else:
-            return Decimal("0.4")
+        return self._CONFIDENCE_MULTIPLIERS[
+            bisect_right(self._CONFIDENCE_THRESHOLDS, confidence)
+        ]
 
     def _calculate_pair_confidence(self, market_data: Dict[str, Any]) -> float:
         """
@@ -171,6 +366,39 @@ class TradingStrategy:
 
         return round(confidence, 2)
 
+    def _calculate_pair_confidences(self, market_datas: List[Dict[str, Any]]) -> List[float]:
+        """
+        Calculate confidence scores for many trading pairs at once, scoring
+        large batches with NumPy array operations.
+        """
+        if len(market_datas) < self._VECTORIZE_MIN_PAIRS:
+            return [self._calculate_pair_confidence(md) for md in market_datas]
+
+        count = len(market_datas)
+        scores = self._score_pair_features(
+            np.fromiter((float(md.get("volume_24h", 0)) for md in market_datas), dtype=np.float64, count=count),
+            np.fromiter((float(md.get("volatility", 0)) for md in market_datas), dtype=np.float64, count=count),
+            np.fromiter((float(md.get("liquidity_score", 0)) for md in market_datas), dtype=np.float64, count=count)
+        )
+
+        return [round(float(score), 2) for score in scores]
+
+    @staticmethod
+    def _score_pair_features(
+        volumes: np.ndarray,
+        volatilities: np.ndarray,
+        liquidity_scores: np.ndarray
+    ) -> np.ndarray:
+        """
+        Weighted pair confidence for arrays of raw market metrics, evaluated in
+        the same operation order as _calculate_pair_confidence so rounding agrees.
+        """
+        return (
+            np.minimum(volumes / 1_000_000, 1.0) * 0.4 +
+            np.minimum(volatilities * 10, 1.0) * 0.3 +
+            np.minimum(liquidity_scores, 1.0) * 0.3
+        )
+
     def _generate_entry_conditions(
         self,
         symbol: str,
@@ -183,45 +411,44 @@ class TradingStrategy:
         volatility = float(market_data.get("volatility", 0))
         current_price = float(market_data.get("price", 0))
 
-        if signal_type == "long":
-            return [
-                {
-                    "stage": 1,
-                    "price": current_price,
-                    "type": "market",
-                    "description": "Initial entry"
-                },
-                {
-                    "stage": 2,
-                    "price": current_price * (1 - volatility * 0.5),
-                    "type": "limit",
-                    "description": "First dip buy"
-                },
-                {
-                    "stage": 3,
-                    "price": current_price * (1 - volatility),
-                    "type": "limit",
-                    "description": "Second dip buy"
-                }
-            ]
-        else:  # short
-            return [
-                {
-                    "stage": 1,
-                    "price": current_price,
-                    "type": "market",
-                    "description": "Initial entry"
-                },
-                {
-                    "stage": 2,
-                    "price": current_price * (1 + volatility * 0.5),
-                    "type": "limit",
-                    "description": "First bounce sell"
-                },
-                {
-                    "stage": 3,
-                    "price": current_price * (1 + volatility),
-                    "type": "limit",
-                    "description": "Second bounce sell"
-                }
-            ]
+        # Long entries scale in on dips, short entries on bounces
+        is_long = signal_type == "long"
+        signed_volatility = -volatility if is_long else volatility
+
+        return self._build_entry_conditions(is_long, [
+            current_price * (1 + signed_volatility * template[1])
+            for template in self._ENTRY_STAGE_TEMPLATE
+        ])
+
+    def _generate_entry_prices_batch(
+        self,
+        prices: List[float],
+        volatilities: List[float],
+        is_long: List[bool]
+    ) -> np.ndarray:
+        """
+        Compute staged entry prices for many signals at once.
+
+        Returns:
+            (N, stages) array of entry prices, one row per signal
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        signed_volatilities = np.where(is_long, -1.0, 1.0) * np.asarray(volatilities, dtype=np.float64)
+
+        return prices[:, None] * (1 + signed_volatilities[:, None] * self._ENTRY_STAGE_FACTORS)
+
+    def _build_entry_conditions(self, is_long: bool, prices: List[float]) -> List[Dict[str, Any]]:
+        """
+        Build staged entry condition dicts from per-stage entry prices.
+        """
+        description_index = 3 if is_long else 4
+
+        return [
+            {
+                "stage": template[0],
+                "price": price,
+                "type": template[2],
+                "description": template[description_index]
+            }
+            for template, price in zip(self._ENTRY_STAGE_TEMPLATE, prices)
+        ]
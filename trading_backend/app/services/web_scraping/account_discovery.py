@@ -1,47 +1,107 @@
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Optional, Tuple
 import logging
 import tweepy
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from datetime import datetime, timedelta
 import asyncio
-from collections import defaultdict
+import functools
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict, deque
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# Process-wide pool for the blocking Tweepy / YouTube SDK calls, shared by every
+# AccountDiscovery so that constructing instances never spawns new threads
+_SDK_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix='account-discovery')
+
 class RateLimiter:
+    __slots__ = ("max_requests", "time_window", "requests", "_lock")
+
     def __init__(self, max_requests: int, time_window: int):
         self.max_requests = max_requests
         self.time_window = time_window
-        self.requests = []
+        self.requests = deque(maxlen=max_requests)  # monotonic timestamps, oldest first
+        self._lock = asyncio.Lock()
 
     async def acquire(self):
-        now = datetime.now()
-        self.requests = [ts for ts in self.requests if now - ts < timedelta(seconds=self.time_window)]
-
-        if len(self.requests) >= self.max_requests:
-            sleep_time = (self.requests[0] + timedelta(seconds=self.time_window) - now).total_seconds()
-            if sleep_time > 0:
-                await asyncio.sleep(sleep_time)
-            self.requests.pop(0)
-
-        self.requests.append(now)
+        # Serialize callers so concurrent discovery tasks can't overshoot the limit
+        async with self._lock:
+            now = time.monotonic()
+            cutoff = now - self.time_window
+            while self.requests and self.requests[0] <= cutoff:
+                self.requests.popleft()
+
+            if len(self.requests) >= self.max_requests:
+                sleep_time = self.requests[0] + self.time_window - now
+                if sleep_time > 0:
+                    await asyncio.sleep(sleep_time)
+                self.requests.popleft()
+                now = time.monotonic()
+
+            self.requests.append(now)
 
 class AccountDiscovery:
     """Discovers related trading accounts across social media platforms"""
 
+    # Any of these in a channel's title or description marks it as trading-related
+    _TRADING_CHANNEL_RE = re.compile(
+        'trading|crypto|bitcoin|cryptocurrency|blockchain|investment|finance|market analysis'
+    )
+
+    # YouTube Data API limit on ids per channels().list call
+    _YOUTUBE_MAX_IDS_PER_REQUEST = 50
+
+    # Follower/friend pagination: users per page (API maximum), and per-source
+    # caps on users scanned and influential traders collected before stopping
+    _TWITTER_PAGE_SIZE = 200
+    _TWITTER_MAX_USERS_PER_SOURCE = 500
+    _TWITTER_MAX_CANDIDATES_PER_SOURCE = 10
+
+    # Upper bound on remembered per-user verdicts between discovery passes
+    _SCORED_USERS_MAX = 50000
+
+    # Profile keywords and their weight towards the trader keyword score
+    _TRADER_KEYWORD_WEIGHTS = {
+        'trader': 2,
+        'trading': 2,
+        'crypto': 1,
+        'bitcoin': 1,
+        'ethereum': 1,
+        'analyst': 1.5,
+        'investor': 1.5,
+        'finance': 1,
+        'blockchain': 1,
+        'market': 1,
+        'technical analysis': 2,
+        'fundamental analysis': 2,
+        'defi': 1.5
+    }
+    # Single-pass substring scan; the lookahead reports overlapping keywords too
+    _TRADER_KEYWORD_RE = re.compile(
+        '(?=(' + '|'.join(map(re.escape, _TRADER_KEYWORD_WEIGHTS)) + '))'
+    )
+
     def __init__(
         self,
         twitter_api_key: str = None,
         twitter_api_secret: str = None,
         twitter_access_token: str = None,
         twitter_access_secret: str = None,
-        youtube_api_key: str = None
+        youtube_api_key: str = None,
+        cache_dir: str = None
     ):
         self.twitter_client = None
         self.youtube_client = None
         self.twitter_rate_limiter = RateLimiter(max_requests=180, time_window=900)  # 180 requests per 15 minutes
         self.youtube_rate_limiter = RateLimiter(max_requests=100, time_window=100)  # 100 requests per 100 seconds
+        self.twitter_semaphore = asyncio.Semaphore(8)  # Max seed accounts processed concurrently
 
         # Enhanced seed accounts including major institutions
         self.seed_accounts = {
@@ -102,8 +162,16 @@ class AccountDiscovery:
 
         # Cache with TTL
         self.cache_duration = timedelta(hours=6)  # Reduced from 24 hours for more frequent updates
-        self.discovered_accounts: Dict[str, Dict[str, dict]] = defaultdict(dict)
         self.last_discovery: Dict[str, datetime] = {}
+        # Discovery results keyed by _discovery_cache_key; also saved as JSON to
+        # cache_dir (when set) so warm restarts skip the external APIs
+        self.cache_dir = cache_dir
+        self._discovery_results: Dict[str, Dict[str, List]] = {}
+        self._discovery_locks: Dict[str, asyncio.Lock] = {}
+
+        # Twitter user id -> (evaluation time, trader metrics or None if not influential),
+        # oldest evaluation first so expired and surplus entries are evicted from the front
+        self._scored_users: OrderedDict[int, Tuple[datetime, Optional[Dict]]] = OrderedDict()
 
         if all([twitter_api_key, twitter_api_secret, twitter_access_token, twitter_access_secret]):
             self.twitter_client = self._init_twitter_client(
@@ -132,187 +200,342 @@ class AccountDiscovery:
         """Initialize YouTube API client"""
         return build('youtube', 'v3', developerKey=api_key)
 
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking SDK call on the shared executor without stalling the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_SDK_EXECUTOR, functools.partial(func, *args, **kwargs))
+
     async def find_related_accounts(self, seed_accounts: List[str]) -> Dict[str, List[Dict]]:
         """Find related trading accounts based on seed accounts with detailed metrics"""
-        discovered = {
-            'twitter': [],
-            'youtube': []
-        }
-
-        if self.twitter_client:
-            twitter_accounts = await self._discover_twitter_accounts(seed_accounts)
-            discovered['twitter'] = twitter_accounts
-
-        if self.youtube_client:
-            youtube_channels = await self._discover_youtube_channels(seed_accounts)
-            discovered['youtube'] = youtube_channels
+        key = self._discovery_cache_key(seed_accounts)
+
+        # One discovery per key at a time; waiters pick up the fresh cache entry
+        # while discoveries for other seed sets proceed independently
+        async with self._discovery_locks.setdefault(key, asyncio.Lock()):
+            now = datetime.now()
+            cached = await self._get_cached_discovery(key, now)
+            if cached is not None:
+                return cached
+
+            # The platforms have independent rate limits, so discover on both at once
+            twitter_accounts, youtube_channels = await asyncio.gather(
+                self._discover_twitter_accounts(seed_accounts) if self.twitter_client else self._no_accounts(),
+                self._discover_youtube_channels(seed_accounts) if self.youtube_client else self._no_accounts()
+            )
 
-        return discovered
+            discovered = {
+                'twitter': twitter_accounts,
+                'youtube': youtube_channels
+            }
+            await self._store_discovery(key, discovered, now)
+
+            return discovered
+
+    def _discovery_cache_key(self, seed_accounts: List[str]) -> str:
+        """Hash of everything that determines a discovery result"""
+        params = {
+            'seeds': sorted(seed_accounts),
+            'platforms': [bool(self.twitter_client), bool(self.youtube_client)],
+            'min_follower_count': self.min_follower_count,
+            'min_engagement_rate': self.min_engagement_rate,
+            'min_trading_content_ratio': self.min_trading_content_ratio,
+            'min_verified_status': self.min_verified_status
+        }
+        return hashlib.md5(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+    def _discovery_cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    async def _get_cached_discovery(self, key: str, now: datetime) -> Optional[Dict[str, List]]:
+        """Return a discovery result younger than cache_duration from memory or disk"""
+        if key not in self._discovery_results and self.cache_dir:
+            try:
+                entry = await self._run_blocking(self._read_cache_file, self._discovery_cache_path(key))
+                self.last_discovery[key] = datetime.fromisoformat(entry['timestamp'])
+                self._discovery_results[key] = {
+                    'twitter': entry['result']['twitter'],
+                    # Discovered channels are a set; a disabled platform yields []
+                    'youtube': set(entry['result']['youtube']) if self.youtube_client else []
+                }
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Error loading account discovery cache: {str(e)}")
+
+        if key in self._discovery_results and now - self.last_discovery[key] < self.cache_duration:
+            return self._discovery_results[key]
+        return None
+
+    async def _store_discovery(self, key: str, discovered: Dict[str, List], now: datetime):
+        """Cache a discovery result in memory and, if configured, on disk"""
+        self.last_discovery[key] = now
+        self._discovery_results[key] = discovered
+
+        if self.cache_dir:
+            try:
+                await self._run_blocking(
+                    self._write_cache_file,
+                    self._discovery_cache_path(key),
+                    {
+                        'timestamp': now.isoformat(),
+                        'result': {
+                            'twitter': discovered['twitter'],
+                            'youtube': sorted(discovered['youtube'])
+                        }
+                    }
+                )
+            except Exception as e:
+                logger.warning(f"Error saving account discovery cache: {str(e)}")
+
+    @staticmethod
+    def _read_cache_file(path: str) -> Dict:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write_cache_file(path: str, entry: Dict):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so readers never see a partial file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    async def _no_accounts() -> List:
+        """Discovery result for a platform without a configured client"""
+        return []
 
     async def _discover_twitter_accounts(self, seed_accounts: List[str]) -> List[Dict]:
         """Discover related Twitter accounts with enhanced metrics"""
-        discovered = []
-        try:
-            for account in seed_accounts:
-                await self.twitter_rate_limiter.acquire()
+        now = datetime.now()  # Shared reference time for account ages in this pass
+        seen = set()  # User ids already evaluated in this pass; seeds share followers
+        results = await asyncio.gather(
+            *(self._process_twitter_seed(account, now, seen) for account in seed_accounts),
+            return_exceptions=True
+        )
 
-                # Get user's followers who are likely traders
-                followers = self.twitter_client.get_followers(
-                    screen_name=account,
-                    count=100  # Increased from 2
-                )
+        for account, result in zip(seed_accounts, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error discovering Twitter accounts from {account}: {str(result)}")
+
+        # Each seed task builds its own list; flatten them in a single pass
+        return list(chain.from_iterable(
+            result for result in results if not isinstance(result, Exception)
+        ))
+
+    async def _process_twitter_seed(self, account: str, now: datetime, seen: Set) -> List[Dict]:
+        """Discover influential traders among one seed account's followers and friends"""
+        async with self.twitter_semaphore:
+            # Get user's followers who are likely traders
+            discovered = await self._scan_twitter_users(
+                self.twitter_client.get_followers, account, 'follower', now, seen
+            )
 
-                for follower in followers:
-                    if await self._is_influential_trader(follower):
-                        metrics = await self._calculate_trader_metrics(follower)
-                        discovered.append({
-                            'username': follower.screen_name,
-                            'metrics': metrics,
-                            'source': 'follower',
-                            'seed_account': account
-                        })
-
-                # Get accounts that the user follows
-                await self.twitter_rate_limiter.acquire()
-                following = self.twitter_client.get_friends(
-                    screen_name=account,
-                    count=100  # Increased from 2
-                )
+            # Get accounts that the user follows
+            discovered.extend(await self._scan_twitter_users(
+                self.twitter_client.get_friends, account, 'following', now, seen
+            ))
 
-                for friend in following:
-                    if await self._is_influential_trader(friend):
-                        metrics = await self._calculate_trader_metrics(friend)
-                        discovered.append({
-                            'username': friend.screen_name,
-                            'metrics': metrics,
-                            'source': 'following',
-                            'seed_account': account
-                        })
+        return discovered
 
-        except Exception as e:
-            logger.error(f"Error discovering Twitter accounts: {str(e)}")
+    async def _scan_twitter_users(
+        self,
+        method,
+        account: str,
+        source: str,
+        now: datetime,
+        seen: Set
+    ) -> List[Dict]:
+        """
+        Page through a seed account's user list, stopping once enough influential
+        traders were found or the scan limit was reached.
+        """
+        discovered = []
+        scanned = 0
+        pages = tweepy.Cursor(
+            method, screen_name=account, count=self._TWITTER_PAGE_SIZE
+        ).pages()
+
+        while (len(discovered) < self._TWITTER_MAX_CANDIDATES_PER_SOURCE
+               and scanned < self._TWITTER_MAX_USERS_PER_SOURCE):
+            await self.twitter_rate_limiter.acquire()
+            page = await self._run_blocking(next, pages, None)
+            if not page:
+                break
+
+            for user in page:
+                scanned += 1
+                metrics = await self._evaluate_twitter_user(user, now, seen)
+                if metrics is not None:
+                    discovered.append({
+                        'username': user.screen_name,
+                        'metrics': metrics,
+                        'source': source,
+                        'seed_account': account
+                    })
+                    if len(discovered) >= self._TWITTER_MAX_CANDIDATES_PER_SOURCE:
+                        break
+                if scanned >= self._TWITTER_MAX_USERS_PER_SOURCE:
+                    break
 
         return discovered
 
+    async def _evaluate_twitter_user(self, user, now: datetime, seen: Set) -> Optional[Dict]:
+        """
+        Return trader metrics for an influential user, or None if the user is not
+        influential or was already evaluated in this discovery pass.
+        """
+        if user.id in seen:
+            return None
+        seen.add(user.id)
+
+        # Reuse the verdict from a recent discovery pass
+        scored = self._scored_users.get(user.id)
+        if scored is not None and now - scored[0] < self.cache_duration:
+            return scored[1]
+
+        metrics = None
+        if await self._is_influential_trader(user, now):
+            metrics = await self._calculate_trader_metrics(user, now)
+        self._remember_score(user.id, now, metrics)
+        return metrics
+
+    def _remember_score(self, user_id: int, now: datetime, metrics: Optional[Dict]):
+        """Record a user verdict, dropping expired entries and the oldest beyond the cap"""
+        self._scored_users[user_id] = (now, metrics)
+        self._scored_users.move_to_end(user_id)
+        while self._scored_users:
+            oldest_id, (scored_at, _) = next(iter(self._scored_users.items()))
+            if len(self._scored_users) <= self._SCORED_USERS_MAX and now - scored_at < self.cache_duration:
+                break
+            del self._scored_users[oldest_id]
+
     async def _discover_youtube_channels(self, seed_accounts: List[str]) -> Set[str]:
         """Discover related YouTube channels"""
         discovered = set()
         try:
+            # Collect trading channels from every seed before resolving related channels
+            channel_ids = []
             for account in seed_accounts:
                 # Search for channels related to trading
-                search_response = self.youtube_client.search().list(
-                    q=f"{account} crypto trading",
-                    type='channel',
-                    part='snippet',
-                    maxResults=50
-                ).execute()
+                search_response = await self._run_blocking(
+                    self.youtube_client.search().list(
+                        q=f"{account} crypto trading",
+                        type='channel',
+                        part='snippet',
+                        maxResults=50
+                    ).execute
+                )
 
                 for item in search_response.get('items', []):
                     channel_name = item['snippet']['channelTitle']
                     if self._is_trading_channel(item['snippet']):
                         discovered.add(channel_name)
+                        channel_ids.append(item['snippet']['channelId'])
 
-                        # Get related channels
-                        channel_id = item['snippet']['channelId']
-                        related_channels = self._get_related_channels(channel_id)
-                        discovered.update(related_channels)
+            # Get related channels for all discovered channels in batched lookups
+            featured_channels = await self._get_featured_channel_ids(channel_ids)
+            discovered.update(await self._get_trading_channel_titles(featured_channels))
 
         except HttpError as e:
             logger.error(f"Error discovering YouTube channels: {str(e)}")
 
         return discovered
 
-    def _get_related_channels(self, channel_id: str) -> Set[str]:
-        """Get related channels for a YouTube channel"""
-        related = set()
+    async def _list_channels(self, channel_ids: List[str], part: str) -> List[Dict]:
+        """Fetch channel resources, packing up to 50 ids into each API call"""
+        items = []
+        unique_ids = list(dict.fromkeys(channel_ids))
+        for i in range(0, len(unique_ids), self._YOUTUBE_MAX_IDS_PER_REQUEST):
+            response = await self._run_blocking(
+                self.youtube_client.channels().list(
+                    id=','.join(unique_ids[i:i + self._YOUTUBE_MAX_IDS_PER_REQUEST]),
+                    part=part
+                ).execute
+            )
+            items.extend(response.get('items', []))
+        return items
+
+    async def _get_featured_channel_ids(self, channel_ids: List[str]) -> List[str]:
+        """Get the featured channels of several YouTube channels"""
+        featured = []
         try:
-            # Get channel's featured channels
-            channels_response = self.youtube_client.channels().list(
-                id=channel_id,
-                part='brandingSettings'
-            ).execute()
-
-            if channels_response['items']:
-                featured_channels = channels_response['items'][0].get(
-                    'brandingSettings', {}
-                ).get('channel', {}).get('featuredChannelsUrls', [])
-
-                if featured_channels:
-                    channels_info = self.youtube_client.channels().list(
-                        id=','.join(featured_channels),
-                        part='snippet'
-                    ).execute()
-
-                    for channel in channels_info.get('items', []):
-                        if self._is_trading_channel(channel['snippet']):
-                            related.add(channel['snippet']['title'])
+            for channel in await self._list_channels(channel_ids, 'brandingSettings'):
+                featured.extend(
+                    channel.get('brandingSettings', {})
+                    .get('channel', {})
+                    .get('featuredChannelsUrls', [])
+                )
+        except HttpError as e:
+            logger.error(f"Error getting related channels: {str(e)}")
+
+        return featured
 
+    async def _get_trading_channel_titles(self, channel_ids: List[str]) -> Set[str]:
+        """Get the titles of the trading-related channels among channel_ids"""
+        titles = set()
+        try:
+            for channel in await self._list_channels(channel_ids, 'snippet'):
+                if self._is_trading_channel(channel['snippet']):
+                    titles.add(channel['snippet']['title'])
         except HttpError as e:
             logger.error(f"Error getting related channels: {str(e)}")
 
-        return related
+        return titles
 
-    async def _is_influential_trader(self, user) -> bool:
+    async def _is_influential_trader(self, user, now: datetime = None) -> bool:
         """Enhanced check for influential traders with more sophisticated metrics"""
-        if not user.verified and self.min_verified_status:
+        # Cheapest and most selective checks first; most candidates stop here
+        if self.min_verified_status and not user.verified:
             return False
 
-        trading_keywords = {
-            'trader': 2,
-            'trading': 2,
-            'crypto': 1,
-            'bitcoin': 1,
-            'ethereum': 1,
-            'analyst': 1.5,
-            'investor': 1.5,
-            'finance': 1,
-            'blockchain': 1,
-            'market': 1,
-            'technical analysis': 2,
-            'fundamental analysis': 2,
-            'defi': 1.5
-        }
+        if user.followers_count < self.min_follower_count:
+            return False
 
-        description = user.description.lower() if user.description else ""
-        name = user.name.lower() if user.name else ""
+        if now is None:
+            now = datetime.now()
 
-        # Calculate keyword score
-        keyword_score = sum(weight for keyword, weight in trading_keywords.items()
-                          if keyword in description or keyword in name)
+        # At least one tweet every 2 days
+        activity_rate = user.statuses_count / max((now - user.created_at).days, 1)
+        if activity_rate < 0.5:
+            return False
 
-        # Calculate engagement score
         engagement_rate = user.followers_count / max(user.friends_count, 1)
-        activity_rate = user.statuses_count / max((datetime.now() - user.created_at).days, 1)
+        if engagement_rate < self.min_engagement_rate:
+            return False
 
-        return (
-            user.followers_count >= self.min_follower_count and
-            engagement_rate >= self.min_engagement_rate and
-            activity_rate >= 0.5 and  # At least one tweet every 2 days
-            keyword_score >= 3  # Require multiple relevant keywords
-        )
+        description = user.description.lower() if user.description else ""
+        name = user.name.lower() if user.name else ""
 
-    async def _calculate_trader_metrics(self, user) -> Dict:
+        # Calculate keyword score; each keyword counts once across description and name
+        matched = set(self._TRADER_KEYWORD_RE.findall(f"{description}\n{name}"))
+        keyword_score = sum(self._TRADER_KEYWORD_WEIGHTS[keyword] for keyword in matched)
+
+        return keyword_score >= 3  # Require multiple relevant keywords
+
+    async def _calculate_trader_metrics(self, user, now: datetime = None) -> Dict:
         """Calculate detailed metrics for a trader account"""
+        if now is None:
+            now = datetime.now()
+
+        account_age_days = (now - user.created_at).days
+        tweets_per_day = user.statuses_count / max(account_age_days, 1)
+
         return {
             'followers_count': user.followers_count,
             'engagement_rate': user.followers_count / max(user.friends_count, 1),
-            'activity_rate': user.statuses_count / max((datetime.now() - user.created_at).days, 1),
+            'activity_rate': tweets_per_day,
             'verified': user.verified,
-            'account_age_days': (datetime.now() - user.created_at).days,
-            'avg_tweets_per_day': user.statuses_count / max((datetime.now() - user.created_at).days, 1),
+            'account_age_days': account_age_days,
+            'avg_tweets_per_day': tweets_per_day,
             'listed_count': user.listed_count,
             'has_website': bool(user.url)
         }
 
     def _is_trading_channel(self, snippet: Dict) -> bool:
         """Check if a YouTube channel is trading-related"""
-        keywords = [
-            'trading', 'crypto', 'bitcoin', 'cryptocurrency',
-            'blockchain', 'investment', 'finance', 'market analysis'
-        ]
-
         title = snippet.get('title', '').lower()
         description = snippet.get('description', '').lower()
 
-        return any(keyword in title or keyword in description
-                  for keyword in keywords)
+        return bool(self._TRADING_CHANNEL_RE.search(f"{title}\n{description}"))
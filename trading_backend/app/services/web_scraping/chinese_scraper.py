@@ -1,17 +1,39 @@
 import logging
 import jieba
 import asyncio
+import functools
+import re
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from selectolax.lexbor import LexborHTMLParser
 import aiohttp
 from .base_scraper import BaseScraper
+from .content_extractor import REQUEST_TIMEOUT, read_text_limited
 
 logger = logging.getLogger(__name__)
 
 class ChineseScraper(BaseScraper):
     """Scraper for Chinese social media platforms."""
 
+    # Post container, content element and post type per platform
+    _POST_SELECTORS = {
+        'weibo': ('div.card-wrap', 'p.txt', 'post'),
+        'zhihu': ('div.List-item', 'span.RichText', 'answer'),
+        'xiaohongshu': ('div.note-item', 'div.content', 'note')
+    }
+
+    # Post containers for the BeautifulSoup fallback; parsing skips everything outside
+    # them. Strainers see the raw class attribute, so match the class as a whole word
+    _POST_STRAINERS = {
+        platform: SoupStrainer('div', class_=re.compile(rf'(?:^|\s){css_class}(?:\s|$)'))
+        for platform, css_class in (
+            ('weibo', 'card-wrap'),
+            ('zhihu', 'List-item'),
+            ('xiaohongshu', 'note-item')
+        )
+    }
+
     def __init__(self, config: Dict = None):
         super().__init__(config or {})
         self.platforms = {
@@ -22,6 +44,62 @@ class ChineseScraper(BaseScraper):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        # Chinese-specific sentiment indicators with weights
+        sentiment_indicators = {
+            'bullish': {
+                '牛市': 1.2, '突破': 1.1, '上涨': 0.9, '买入': 0.9,
+                '看多': 1.0, '支撑': 0.7, '建仓': 0.9, '强势': 0.8,
+                '反弹': 0.7, '底部': 0.8, '积累': 0.7, '上升': 0.8
+            },
+            'bearish': {
+                '熊市': 1.2, '下跌': 1.1, '抛售': 0.9, '卖出': 0.9,
+                '看空': 1.0, '阻力': 0.7, '清仓': 0.9, '弱势': 0.8,
+                '回调': 0.7, '顶部': 0.8, '抛压': 0.7, '下降': 0.8
+            }
+        }
+        # Merged word -> (weight, is_bullish) lookup so each token is checked once
+        self.sentiment_lexicon = {
+            word: (weight, polarity == 'bullish')
+            for polarity, words in sentiment_indicators.items()
+            for word, weight in words.items()
+        }
+        # jieba output is deterministic, so reposted texts can reuse their keyword scores
+        self._cached_keyword_scores = functools.lru_cache(maxsize=8192)(self._score_keywords)
+        # Cap on keyword searches in flight per scrape_platform call
+        self.max_concurrent_requests = 16
+        # Shared across scrapes so pooled keep-alive connections and DNS lookups are reused
+        self.session = None
+        # Guards the one-time model load in _get_sentiment_analyzer
+        self._sentiment_analyzer_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use."""
+        if not self.session or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=self.max_concurrent_requests,
+                ttl_dns_cache=300,
+                keepalive_timeout=30
+            )
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=connector,
+                timeout=REQUEST_TIMEOUT
+            )
+        return self.session
+
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
 
     async def scrape_platform(self, platform: str, keywords: List[str]) -> List[Dict]:
         """Scrape content from specified Chinese platform."""
@@ -29,21 +107,42 @@ class ChineseScraper(BaseScraper):
             if platform not in self.platforms:
                 raise ValueError(f"Unsupported platform: {platform}")
 
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                results = []
-                for keyword in keywords:
-                    url = self._build_search_url(platform, keyword)
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            content = await response.text()
-                            parsed_content = self._parse_content(platform, content)
-                            results.extend(parsed_content)
-
-                return results
+            session = await self._get_session()
+            # Keyword searches are independent, so run them concurrently
+            semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+            pages = await asyncio.gather(
+                *(self._fetch_search_results(session, semaphore, platform, keyword)
+                  for keyword in keywords),
+                return_exceptions=True
+            )
+
+            results = []
+            for keyword, page in zip(keywords, pages):
+                if isinstance(page, Exception):
+                    logger.error(f"Error scraping {platform} for '{keyword}': {str(page)}")
+                    continue
+                results.extend(page)
+
+            return results
         except Exception as e:
             logger.error(f"Error scraping {platform}: {str(e)}")
             return []
 
+    async def _fetch_search_results(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        platform: str,
+        keyword: str
+    ) -> List[Dict]:
+        """Fetch and parse one keyword search page."""
+        url = self._build_search_url(platform, keyword)
+        async with semaphore, session.get(url) as response:
+            if response.status != 200:
+                return []
+            content = await read_text_limited(response)
+        return self._parse_content(platform, content)
+
     def _build_search_url(self, platform: str, keyword: str) -> str:
         """Build search URL for different platforms."""
         base_url = self.platforms[platform]
@@ -57,72 +156,75 @@ class ChineseScraper(BaseScraper):
 
     def _parse_content(self, platform: str, content: str) -> List[Dict]:
         """Parse scraped content based on platform."""
-        try:
-            soup = BeautifulSoup(content, 'html.parser')
-            results = []
+        if platform not in self._POST_SELECTORS:
+            return []
 
-            if platform == 'weibo':
-                results = self._parse_weibo(soup)
-            elif platform == 'zhihu':
-                results = self._parse_zhihu(soup)
-            elif platform == 'xiaohongshu':
-                results = self._parse_xiaohongshu(soup)
+        try:
+            return self._select_posts(platform, content)
+        except Exception as e:
+            logger.warning(f"Falling back to BeautifulSoup for {platform} content: {str(e)}")
 
-            return results
+        try:
+            soup = BeautifulSoup(content, 'lxml', parse_only=self._POST_STRAINERS[platform])
+            return self._soup_posts(platform, soup)
         except Exception as e:
             logger.error(f"Error parsing {platform} content: {str(e)}")
             return []
 
-    def _parse_weibo(self, soup: BeautifulSoup) -> List[Dict]:
-        """Parse Weibo content."""
+    def _select_posts(self, platform: str, content: str) -> List[Dict]:
+        """Extract posts with the lexbor CSS engine, without building a Python DOM."""
+        container_selector, content_selector, post_type = self._POST_SELECTORS[platform]
         posts = []
-        for post in soup.find_all('div', class_='card-wrap'):
-            try:
-                content = post.find('p', class_='txt')
-                if content:
-                    posts.append({
-                        'platform': 'weibo',
-                        'content': content.text.strip(),
-                        'timestamp': datetime.now().isoformat(),
-                        'type': 'post'
-                    })
-            except Exception as e:
-                logger.error(f"Error parsing Weibo post: {str(e)}")
+        timestamp = datetime.now().isoformat()  # One scrape time for the whole page
+        for post in LexborHTMLParser(content).css(container_selector):
+            node = post.css_first(content_selector)
+            if node is not None:
+                posts.append({
+                    'platform': platform,
+                    'content': node.text().strip(),
+                    'timestamp': timestamp,
+                    'type': post_type
+                })
         return posts
 
-    def _parse_zhihu(self, soup: BeautifulSoup) -> List[Dict]:
-        """Parse Zhihu content."""
+    def _soup_posts(self, platform: str, soup: BeautifulSoup) -> List[Dict]:
+        """Extract posts from a BeautifulSoup tree using the same selectors."""
+        container_selector, content_selector, post_type = self._POST_SELECTORS[platform]
         posts = []
-        for post in soup.find_all('div', class_='List-item'):
-            try:
-                content = post.find('span', class_='RichText')
-                if content:
-                    posts.append({
-                        'platform': 'zhihu',
-                        'content': content.text.strip(),
-                        'timestamp': datetime.now().isoformat(),
-                        'type': 'answer'
-                    })
-            except Exception as e:
-                logger.error(f"Error parsing Zhihu post: {str(e)}")
+        timestamp = datetime.now().isoformat()
+        for post in soup.select(container_selector):
+            node = post.select_one(content_selector)
+            if node is not None:
+                posts.append({
+                    'platform': platform,
+                    'content': node.text.strip(),
+                    'timestamp': timestamp,
+                    'type': post_type
+                })
         return posts
 
-    def _parse_xiaohongshu(self, soup: BeautifulSoup) -> List[Dict]:
-        """Parse Xiaohongshu content."""
-        posts = []
-        for post in soup.find_all('div', class_='note-item'):
-            try:
-                content = post.find('div', class_='content')
-                if content:
-                    posts.append({
-                        'platform': 'xiaohongshu',
-                        'content': content.text.strip(),
-                        'timestamp': datetime.now().isoformat(),
-                        'type': 'note'
-                    })
-            except Exception as e:
-                logger.error(f"Error parsing Xiaohongshu post: {str(e)}")
-        return posts
+    async def _get_sentiment_analyzer(self):
+        """Return the Chinese BERT analyzer, loading the model once and off the event loop."""
+        if self.sentiment_analyzer is None:
+            async with self._sentiment_analyzer_lock:
+                if self.sentiment_analyzer is None:
+                    from .sentiment_analyzer import SentimentAnalyzer
+                    self.sentiment_analyzer = await asyncio.to_thread(SentimentAnalyzer.instance, 'chinese')
+        return self.sentiment_analyzer
+
+    def _score_keywords(self, text: str) -> Tuple[float, float]:
+        """Weighted (bullish, bearish) keyword scores from a single pass over the tokens."""
+        bullish_score = 0.0
+        bearish_score = 0.0
+        for word in jieba.cut(text):
+            indicator = self.sentiment_lexicon.get(word)
+            if indicator is not None:
+                weight, is_bullish = indicator
+                if is_bullish:
+                    bullish_score += weight
+                else:
+                    bearish_score += weight
+        return bullish_score, bearish_score
 
     async def analyze_sentiment(self, text: str) -> Tuple[float, float]:
         """
@@ -133,39 +235,14 @@ class ChineseScraper(BaseScraper):
             - confidence_score: ranges from 0 to 1
         """
         try:
-            # Initialize sentiment analyzer if not already initialized
-            if not hasattr(self, 'sentiment_analyzer'):
-                from .sentiment_analyzer import SentimentAnalyzer
-                self.sentiment_analyzer = SentimentAnalyzer(language='chinese')
-
-            # Chinese-specific sentiment indicators with weights
-            sentiment_indicators = {
-                'bullish': {
-                    '牛市': 1.2, '突破': 1.1, '上涨': 0.9, '买入': 0.9,
-                    '看多': 1.0, '支撑': 0.7, '建仓': 0.9, '强势': 0.8,
-                    '反弹': 0.7, '底部': 0.8, '积累': 0.7, '上升': 0.8
-                },
-                'bearish': {
-                    '熊市': 1.2, '下跌': 1.1, '抛售': 0.9, '卖出': 0.9,
-                    '看空': 1.0, '阻力': 0.7, '清仓': 0.9, '弱势': 0.8,
-                    '回调': 0.7, '顶部': 0.8, '抛压': 0.7, '下降': 0.8
-                }
-            }
+            sentiment_analyzer = await self._get_sentiment_analyzer()
 
-            # Calculate weighted sentiment scores
-            bullish_score = sum(
-                sentiment_indicators['bullish'].get(word, 0)
-                for word in jieba.cut(text)
-                if word in sentiment_indicators['bullish']
-            )
-            bearish_score = sum(
-                sentiment_indicators['bearish'].get(word, 0)
-                for word in jieba.cut(text)
-                if word in sentiment_indicators['bearish']
+            # Tokenize in a worker thread while the BERT model scores the text,
+            # so jieba's CPU time overlaps with model inference
+            (bullish_score, bearish_score), (base_sentiment, base_confidence) = await asyncio.gather(
+                asyncio.to_thread(self._cached_keyword_scores, text),
+                sentiment_analyzer.analyze_text(text)
             )
-
-            # Get base sentiment from BERT model with debug logging
-            base_sentiment, base_confidence = await self.sentiment_analyzer.analyze_text(text)
             logger.info(f"Base BERT sentiment: {base_sentiment}, confidence: {base_confidence}")
 
             # Combine BERT and keyword-based sentiment with debug logging
@@ -1,31 +1,65 @@
 import asyncio
 import logging
+import os
+import random
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Optional, Dict, Any
 import aiohttp
 import trafilatura
-from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Largest response body read into memory per request
+MAX_RESPONSE_BYTES = 5 * 1024 * 1024
+
+# Give up on slow servers instead of holding a connection (and a worker) forever
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=15, sock_read=10)
+
+async def read_text_limited(response: aiohttp.ClientResponse, max_bytes: int = MAX_RESPONSE_BYTES) -> str:
+    """
+    Read and decode a response body without buffering more than max_bytes.
+    Bodies declared larger than max_bytes are rejected; undeclared ones are truncated.
+    """
+    if response.content_length is not None and response.content_length > max_bytes:
+        raise ValueError(f"Response body of {response.content_length} bytes exceeds {max_bytes} bytes")
+
+    body = bytearray()
+    async for chunk in response.content.iter_chunked(64 * 1024):
+        body += chunk
+        if len(body) >= max_bytes:
+            logger.warning(f"Truncating response from {response.url} at {max_bytes} bytes")
+            del body[max_bytes:]
+            break
+    return body.decode(response.charset or 'utf-8', errors='replace')
+
 class RateLimiter:
     def __init__(self, calls: int, period: int):
         self.calls = calls
         self.period = period
-        self.timestamps: list[datetime] = []
+        self.timestamps = deque(maxlen=calls)  # monotonic timestamps, oldest first
+        self._lock = asyncio.Lock()
 
     async def acquire(self):
-        now = datetime.now()
-        # Remove timestamps older than the period
-        self.timestamps = [ts for ts in self.timestamps if now - ts < timedelta(seconds=self.period)]
-
-        if len(self.timestamps) >= self.calls:
-            # Wait until the oldest timestamp is outside the period
-            wait_time = (self.timestamps[0] + timedelta(seconds=self.period) - now).total_seconds()
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-            self.timestamps.pop(0)
-
-        self.timestamps.append(now)
+        # Serialize callers so concurrent extractions can't overshoot the limit
+        async with self._lock:
+            now = time.monotonic()
+            # Remove timestamps older than the period
+            cutoff = now - self.period
+            while self.timestamps and self.timestamps[0] <= cutoff:
+                self.timestamps.popleft()
+
+            if len(self.timestamps) >= self.calls:
+                # Wait until the oldest timestamp is outside the period
+                wait_time = self.timestamps[0] + self.period - now
+                if wait_time > 0:
+                    await asyncio.sleep(wait_time)
+                self.timestamps.popleft()
+                now = time.monotonic()
+
+            self.timestamps.append(now)
 
 class ContentExtractor:
     def __init__(self):
@@ -34,11 +68,19 @@ class ContentExtractor:
         self.jina_limiter = RateLimiter(calls=100, period=60)
         # Rate limit: 30 requests per minute for Trafilatura
         self.trafilatura_limiter = RateLimiter(calls=30, period=60)
+        # Trafilatura runs in worker threads; bound how many parse at once
+        self.trafilatura_semaphore = asyncio.Semaphore((os.cpu_count() or 1) * 2)
+        # Jina Reader attempts per URL while it answers 429/503, and the longest
+        # back-off worth waiting for before falling back to Trafilatura
+        self.jina_max_retries = 3
+        self.jina_max_retry_delay = 30.0
+        # Monotonic time before which Jina Reader asked us not to call it again
+        self.jina_retry_at = 0.0
         self.session = None
 
     async def __aenter__(self):
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            self.session = self._create_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -46,6 +88,40 @@ class ContentExtractor:
             await self.session.close()
             self.session = None
 
+    @staticmethod
+    def _create_session() -> aiohttp.ClientSession:
+        # Pool keep-alive connections to the reader endpoint across extractions
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=20, ttl_dns_cache=300),
+            timeout=REQUEST_TIMEOUT
+        )
+
+    @staticmethod
+    def _retry_delay(retry_after: Optional[str], attempt: int) -> float:
+        """Seconds to wait before retrying: the Retry-After header if usable, else 2**attempt."""
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+                return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+        return float(2 ** attempt)
+
+    @staticmethod
+    def _trafilatura_extract(url: str) -> tuple[Optional[str], Dict[str, Any]]:
+        """Download and extract a page with Trafilatura in one worker-thread hop."""
+        downloaded = trafilatura.fetch_url(url)
+        if not downloaded:
+            return None, {}
+        content = trafilatura.extract(downloaded)
+        if not content:
+            return None, {}
+        return content, trafilatura.extract_metadata(downloaded) or {}
+
     async def extract_content(self, url: str) -> Dict[str, Any]:
         """
         Extract content from a URL using Jina Reader with Trafilatura as fallback.
@@ -61,18 +137,35 @@ class ContentExtractor:
 
         # Ensure session is initialized
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            self.session = self._create_session()
 
         try:
-            # Try Jina Reader first
-            await self.jina_limiter.acquire()
-            async with self.session.get(f"{self.jina_reader_url}{url}") as response:
-                if response.status == 200:
-                    result["content"] = await response.text()
-                    result["source"] = "jina_reader"
-                    result["success"] = True
-                    return result
-                logger.warning(f"Jina Reader failed with status {response.status} for {url}")
+            # Try Jina Reader first, backing off and retrying while it is rate limiting us
+            for attempt in range(self.jina_max_retries):
+                delay = self.jina_retry_at - time.monotonic()
+                if delay > self.jina_max_retry_delay:
+                    logger.warning(f"Jina Reader backing off for {delay:.0f}s, skipping it for {url}")
+                    break
+                if delay > 0:
+                    await asyncio.sleep(delay + random.uniform(0, 0.25))
+
+                await self.jina_limiter.acquire()
+                async with self.session.get(f"{self.jina_reader_url}{url}") as response:
+                    if response.status == 200:
+                        result["content"] = await read_text_limited(response)
+                        result["source"] = "jina_reader"
+                        result["success"] = True
+                        return result
+                    if response.status not in (429, 503):
+                        logger.warning(f"Jina Reader failed with status {response.status} for {url}")
+                        break
+                    delay = self._retry_delay(response.headers.get("Retry-After"), attempt)
+
+                # Shared across extractions so concurrent callers back off too
+                self.jina_retry_at = max(self.jina_retry_at, time.monotonic() + delay)
+                logger.warning(f"Jina Reader returned {response.status} for {url}, backing off {delay:.1f}s")
+            else:
+                logger.warning(f"Jina Reader still unavailable after {self.jina_max_retries} attempts for {url}")
         except Exception as e:
             logger.error(f"Error using Jina Reader: {str(e)}")
             result["error"] = str(e)
@@ -80,15 +173,15 @@ class ContentExtractor:
         try:
             # Fallback to Trafilatura
             await self.trafilatura_limiter.acquire()
-            downloaded = trafilatura.fetch_url(url)
-            if downloaded:
-                content = trafilatura.extract(downloaded)
-                if content:
-                    result["content"] = content
-                    result["metadata"] = trafilatura.extract_metadata(downloaded) or {}
-                    result["source"] = "trafilatura"
-                    result["success"] = True
-                    return result
+            # Download and lxml parsing are blocking; keep them off the event loop
+            async with self.trafilatura_semaphore:
+                content, metadata = await asyncio.to_thread(self._trafilatura_extract, url)
+            if content:
+                result["content"] = content
+                result["metadata"] = metadata
+                result["source"] = "trafilatura"
+                result["success"] = True
+                return result
         except Exception as e:
             logger.error(f"Error using Trafilatura: {str(e)}")
             if not result["error"]:
@@ -99,15 +192,19 @@ class ContentExtractor:
     async def extract_batch(self, urls: list[str], concurrency: int = 5) -> list[Dict[str, Any]]:
         """
         Extract content from multiple URLs concurrently.
+
+        A pool of ``concurrency`` workers pulls URLs from a shared queue, so a slow URL
+        only ties up its own worker. Results keep the order of ``urls``.
         """
-        async def process_url(url: str) -> Dict[str, Any]:
-            return await self.extract_content(url)
+        results: list[Optional[Dict[str, Any]]] = [None] * len(urls)
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in enumerate(urls):
+            queue.put_nowait(item)
 
-        # Process URLs in batches to control concurrency
-        results = []
-        for i in range(0, len(urls), concurrency):
-            batch = urls[i:i + concurrency]
-            batch_results = await asyncio.gather(*[process_url(url) for url in batch])
-            results.extend(batch_results)
+        async def worker():
+            while not queue.empty():
+                index, url = queue.get_nowait()
+                results[index] = await self.extract_content(url)
 
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, len(urls)))))
         return results
@@ -1,5 +1,7 @@
 from typing import List, Dict, Optional
+import asyncio
 import logging
+import httplib2
 import tweepy
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
@@ -12,6 +14,14 @@ logger = logging.getLogger(__name__)
 class EnglishPlatformScraper:
     """Scraper for English social media platforms (Twitter/X and YouTube)"""
 
+    # Any of these anywhere in the lowercased text marks it as trading related
+    _TRADING_KEYWORDS = (
+        'trading', 'crypto', 'bitcoin', 'btc', 'ethereum', 'eth',
+        'market', 'price', 'analysis', 'signal', 'position',
+        'long', 'short', 'buy', 'sell', 'support', 'resistance',
+        'breakout', 'breakdown', 'trend', 'volume'
+    )
+
     def __init__(
         self,
         twitter_api_key: str,
@@ -29,8 +39,10 @@ class EnglishPlatformScraper:
             twitter_access_secret
         )
         self.youtube_client = self._init_youtube_client(youtube_api_key)
-        self.sentiment_analyzer = sentiment_analyzer or SentimentAnalyzer()
+        self.sentiment_analyzer = sentiment_analyzer or SentimentAnalyzer.instance()
         self.account_discovery = account_discovery or AccountDiscovery()
+        # Cap on accounts/channels fetched concurrently per insights call
+        self.max_concurrent_requests = 8
 
     def _init_twitter_client(
         self,
@@ -50,71 +62,122 @@ class EnglishPlatformScraper:
 
     async def get_twitter_insights(self, accounts: List[str]) -> List[Dict]:
         """Get trading insights from specified Twitter accounts"""
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        results = await asyncio.gather(
+            *(self._get_account_twitter_insights(account, semaphore) for account in accounts),
+            return_exceptions=True
+        )
+
         insights = []
-        try:
-            for account in accounts:
-                tweets = self.twitter_client.user_timeline(
-                    screen_name=account,
-                    count=100,
-                    tweet_mode="extended"
-                )
-                for tweet in tweets:
-                    if self._is_trading_related(tweet.full_text):
-                        sentiment = await self.sentiment_analyzer.analyze_text(tweet.full_text)
-                        insights.append({
-                            'platform': 'twitter',
-                            'author': account,
-                            'content': tweet.full_text,
-                            'sentiment': float(sentiment),
-                            'created_at': tweet.created_at
-                        })
-        except Exception as e:
-            logger.error(f"Error fetching Twitter insights: {str(e)}")
+        for account, result in zip(accounts, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching Twitter insights for {account}: {str(result)}")
+                continue
+            insights.extend(result)
         return insights
 
+    async def _get_account_twitter_insights(self, account: str, semaphore: asyncio.Semaphore) -> List[Dict]:
+        """Get trading insights from one Twitter account"""
+        async with semaphore:
+            tweets = await asyncio.to_thread(
+                self.twitter_client.user_timeline,
+                screen_name=account,
+                count=100,
+                tweet_mode="extended"
+            )
+        trading_tweets = [tweet for tweet in tweets if self._is_trading_related(tweet.full_text)]
+        if not trading_tweets:
+            return []
+
+        # Score all of the account's trading tweets in one batched pass
+        sentiments = await self.sentiment_analyzer.analyze_texts(
+            [tweet.full_text for tweet in trading_tweets]
+        )
+        return [
+            {
+                'platform': 'twitter',
+                'author': account,
+                'content': tweet.full_text,
+                'sentiment': float(sentiment),
+                'created_at': tweet.created_at
+            }
+            for tweet, (sentiment, _) in zip(trading_tweets, sentiments)
+        ]
+
     async def get_youtube_insights(self, channels: List[str]) -> List[Dict]:
         """Get trading insights from specified YouTube channels"""
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        results = await asyncio.gather(
+            *(self._get_channel_youtube_insights(channel, semaphore) for channel in channels),
+            return_exceptions=True
+        )
+
         insights = []
-        try:
-            for channel in channels:
-                # Get channel ID
-                channel_response = self.youtube_client.channels().list(
+        for channel, result in zip(channels, results):
+            if isinstance(result, HttpError):
+                logger.error(f"Error fetching YouTube insights for {channel}: {str(result)}")
+            elif isinstance(result, Exception):
+                logger.error(f"Unexpected error in YouTube insights for {channel}: {str(result)}")
+            else:
+                insights.extend(result)
+        return insights
+
+    async def _get_channel_youtube_insights(self, channel: str, semaphore: asyncio.Semaphore) -> List[Dict]:
+        """Get trading insights from one YouTube channel"""
+        async with semaphore:
+            # Get channel ID
+            channel_response = await self._execute_youtube_request(
+                self.youtube_client.channels().list(
                     part='id',
                     forUsername=channel
-                ).execute()
+                )
+            )
 
-                if not channel_response.get('items'):
-                    continue
+            if not channel_response.get('items'):
+                return []
 
-                channel_id = channel_response['items'][0]['id']
+            channel_id = channel_response['items'][0]['id']
 
-                # Get recent videos
-                videos_response = self.youtube_client.search().list(
+            # Get recent videos
+            videos_response = await self._execute_youtube_request(
+                self.youtube_client.search().list(
                     part='id,snippet',
                     channelId=channel_id,
                     order='date',
                     maxResults=50
-                ).execute()
-
-                for video in videos_response.get('items', []):
-                    title = video['snippet']['title']
-                    description = video['snippet']['description']
-
-                    if self._is_trading_related(title) or self._is_trading_related(description):
-                        content = f"{title}\n{description}"
-                        sentiment = await self.sentiment_analyzer.analyze_text(content)
-                        insights.append({
-                            'platform': 'youtube',
-                            'channel': channel,
-                            'content': content,
-                            'sentiment': float(sentiment),
-                            'published_at': video['snippet']['publishedAt']
-                        })
-        except HttpError as e:
-            logger.error(f"Error fetching YouTube insights: {str(e)}")
-        except Exception as e:
-            logger.error(f"Unexpected error in YouTube insights: {str(e)}")
-        return insights
+                )
+            )
+
+        trading_videos = []
+        for video in videos_response.get('items', []):
+            title = video['snippet']['title']
+            description = video['snippet']['description']
+
+            if self._is_trading_related(title) or self._is_trading_related(description):
+                trading_videos.append((video, f"{title}\n{description}"))
+        if not trading_videos:
+            return []
+
+        # Score all of the channel's trading videos in one batched pass
+        sentiments = await self.sentiment_analyzer.analyze_texts(
+            [content for _, content in trading_videos]
+        )
+        return [
+            {
+                'platform': 'youtube',
+                'channel': channel,
+                'content': content,
+                'sentiment': float(sentiment),
+                'published_at': video['snippet']['publishedAt']
+            }
+            for (video, content), (sentiment, _) in zip(trading_videos, sentiments)
+        ]
+
+    @staticmethod
+    async def _execute_youtube_request(request) -> Dict:
+        """Execute a YouTube API request in a worker thread"""
+        # httplib2 connections are not thread-safe, so each request gets its own
+        return await asyncio.to_thread(request.execute, http=httplib2.Http())
 
     async def discover_related_accounts(self, seed_accounts: List[str]) -> List[str]:
         """Discover related trading accounts based on seed accounts"""
@@ -122,11 +185,5 @@ class EnglishPlatformScraper:
 
     def _is_trading_related(self, text: str) -> bool:
         """Check if content is trading related"""
-        keywords = [
-            'trading', 'crypto', 'bitcoin', 'btc', 'ethereum', 'eth',
-            'market', 'price', 'analysis', 'signal', 'position',
-            'long', 'short', 'buy', 'sell', 'support', 'resistance',
-            'breakout', 'breakdown', 'trend', 'volume'
-        ]
         text_lower = text.lower()
-        return any(keyword in text_lower for keyword in keywords)
+        return any(keyword in text_lower for keyword in self._TRADING_KEYWORDS)
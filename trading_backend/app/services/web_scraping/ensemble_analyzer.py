@@ -1,8 +1,12 @@
 from typing import List, Dict, Tuple, Any, Optional
+import asyncio
+import hashlib
 import logging
 import torch
 from transformers import AutoModelForSequenceClassification, AutoTokenizer
 import os
+from collections import OrderedDict
+from operator import itemgetter
 from .sentiment_analyzer import SentimentAnalyzer
 from app.services.monitoring.technical_indicators import TechnicalIndicators
 from app.services.market_analysis.market_cycle_analyzer import MarketCycleAnalyzer
@@ -12,6 +16,58 @@ logger = logging.getLogger(__name__)
 class EnsembleSentimentAnalyzer:
     """Ensemble sentiment analyzer combining multiple analysis methods."""
 
+    # Vote slots in the weighted aggregation
+    _SENTIMENTS = ('bullish', 'bearish', 'neutral')
+    _SENTIMENT_INDEX = {'bullish': 0, 'bearish': 1, 'neutral': 2}
+
+    # Technical patterns as (pattern, weight, is_bullish)
+    _TECHNICAL_PATTERNS = (
+        ('golden cross', 0.9, True),
+        ('breakout', 0.8, True),
+        ('support', 0.7, True),
+        ('strong volume', 0.7, True),
+        ('accumulation', 0.6, True),
+        ('higher low', 0.6, True),
+        ('uptrend', 0.8, True),
+        ('double bottom', 0.8, True),
+        ('bullish divergence', 0.7, True),
+        ('oversold', 0.6, True),
+        ('death cross', 0.9, False),
+        ('resistance', 0.7, False),
+        ('breakdown', 0.8, False),
+        ('weak volume', 0.7, False),
+        ('distribution', 0.6, False),
+        ('lower high', 0.6, False),
+        ('downtrend', 0.8, False),
+        ('double top', 0.8, False),
+        ('bearish divergence', 0.7, False),
+        ('overbought', 0.6, False)
+    )
+
+    # Market context indicators as (indicator, weight, is_bullish)
+    _MARKET_INDICATORS = (
+        ('institutional buying', 0.9, True),
+        ('accumulation', 0.8, True),
+        ('strong demand', 0.8, True),
+        ('market cycle bottom', 0.9, True),
+        ('oversold', 0.7, True),
+        ('higher low', 0.7, True),
+        ('support level', 0.7, True),
+        ('bullish divergence', 0.8, True),
+        ('increasing volume', 0.7, True),
+        ('market strength', 0.7, True),
+        ('institutional selling', 0.9, False),
+        ('distribution', 0.8, False),
+        ('weak demand', 0.8, False),
+        ('market cycle top', 0.9, False),
+        ('overbought', 0.7, False),
+        ('lower high', 0.7, False),
+        ('resistance level', 0.7, False),
+        ('bearish divergence', 0.8, False),
+        ('decreasing volume', 0.7, False),
+        ('market weakness', 0.7, False)
+    )
+
     def __init__(self, language: str = 'english', model_cache_dir: Optional[str] = None):
         """Initialize ensemble analyzer with component weights and language support."""
         self.language = language.lower()
@@ -20,8 +76,8 @@ class EnsembleSentimentAnalyzer:
         self.tokenizer = None
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
 
-        # Initialize components
-        self.sentiment_analyzer = SentimentAnalyzer()
+        # Initialize components; BERT votes come from this language's shared analyzer
+        self.sentiment_analyzer = SentimentAnalyzer.instance(self.language)
         self.technical_indicators = TechnicalIndicators()
         self.market_analyzer = MarketCycleAnalyzer()
 
@@ -49,22 +105,52 @@ class EnsembleSentimentAnalyzer:
         self.high_confidence = 0.80  # Slightly lower high confidence threshold
         self.neutral_confidence = 0.40  # Lower neutral threshold to reduce neutral classifications
 
+        # Component results keyed by SHA-1 of the text; scraped posts repeat verbatim
+        # (retweets, reposted headlines), so each cache keeps the cache_size most recent
+        self.cache_size = 4096
+        self._bert_cache: OrderedDict[bytes, Tuple[float, float]] = OrderedDict()
+        self._technical_cache: OrderedDict[bytes, Dict[str, Any]] = OrderedDict()
+        self._market_cache: OrderedDict[bytes, Dict[str, Any]] = OrderedDict()
+
+        # Micro-batching: single-text BERT requests arriving within max_batch_delay
+        # seconds of each other share one forward pass of up to max_batch_size texts
+        self.max_batch_size = 32
+        self.max_batch_delay = 0.005
+        self._pending_bert: List[Tuple[str, asyncio.Future]] = []
+        self._bert_flush_handle: Optional[asyncio.TimerHandle] = None
+        self._bert_batches: set = set()  # in-flight batch tasks, kept referenced
+
+        # Skip market context when BERT and technical rules agree above high_confidence;
+        # off by default because the shortcut scores confidence differently
+        self.agreement_fast_path = False
+
         # Initialize model synchronously in constructor
         self._sync_initialize_model()
 
     def _sync_initialize_model(self):
         """Synchronous initialization of the model."""
         try:
+            if self.model_cache_dir is None:
+                # The process-wide analyzer for this language already holds the same
+                # checkpoint; reuse its weights instead of loading another copy
+                shared = self.sentiment_analyzer
+                self.model, self.tokenizer = shared.model, shared.tokenizer
+                logger.info(f"Using shared {self.language} BERT model")
+                return
+
             # Select model based on language
             model_name = 'ProsusAI/finbert' if self.language == 'english' else 'bert-base-chinese'
             model_path = os.path.join('models', 'chinese_bert_finetuned') if self.language == 'chinese' else None
+            # Load half precision weights directly on GPU rather than casting an fp32 copy
+            dtype = torch.float16 if self.device.type == 'cuda' else torch.float32
 
             if model_path and os.path.exists(model_path):
                 logger.info(f"Loading fine-tuned Chinese BERT model from {model_path}")
                 self.model = AutoModelForSequenceClassification.from_pretrained(
                     model_path,
                     num_labels=3,
-                    cache_dir=self.model_cache_dir
+                    cache_dir=self.model_cache_dir,
+                    torch_dtype=dtype
                 )
                 self.tokenizer = AutoTokenizer.from_pretrained(
                     model_path,
@@ -75,7 +161,8 @@ class EnsembleSentimentAnalyzer:
                 self.model = AutoModelForSequenceClassification.from_pretrained(
                     model_name,
                     num_labels=3,
-                    cache_dir=self.model_cache_dir
+                    cache_dir=self.model_cache_dir,
+                    torch_dtype=dtype
                 )
                 self.tokenizer = AutoTokenizer.from_pretrained(
                     model_name,
@@ -92,55 +179,123 @@ class EnsembleSentimentAnalyzer:
             raise
 
     async def initialize_model(self):
-        """Initialize BERT model with proper configuration."""
-        try:
-            # Load FinBERT model and tokenizer
-            self.model = AutoModelForSequenceClassification.from_pretrained(
-                'ProsusAI/finbert',
-                num_labels=3,
-                cache_dir=self.model_cache_dir
-            )
-            self.tokenizer = AutoTokenizer.from_pretrained(
-                'ProsusAI/finbert',
-                cache_dir=self.model_cache_dir
-            )
-
-            # Ensure model is in evaluation mode
-            self.model.eval()
+        """Ensure the BERT model is loaded, optionally validating its label mapping.
 
-            # Verify label mapping
-            # FinBERT's output mapping: 0=negative (bearish), 1=neutral, 2=positive (bullish)
-            test_texts = [
-                "Strong buy signal with increasing volume",  # Should be bullish
-                "Market showing significant weakness",       # Should be bearish
-                "Price consolidating in range"              # Should be neutral
-            ]
-
-            # Validate model outputs
-            for text in test_texts:
-                inputs = self.tokenizer(
-                    text,
-                    return_tensors="pt",
-                    truncation=True,
-                    max_length=512,
-                    padding=True
-                )
-                with torch.no_grad():
-                    outputs = self.model(**inputs)
-                    probs = torch.softmax(outputs.logits, dim=1)
-                    prediction = torch.argmax(probs, dim=1).item()
-                    logger.info(f"Test prediction for '{text}': {prediction}")
+        The constructor already loads the model, so it is only reloaded if missing.
+        Set VALIDATE_MODEL=1 to also run the label-mapping self-check.
+        """
+        try:
+            if self.model is None:
+                await asyncio.to_thread(self._sync_initialize_model)
 
-            logger.info("Model initialization and validation complete")
+            if os.environ.get('VALIDATE_MODEL') == '1':
+                await asyncio.to_thread(self._selfcheck)
+                logger.info("Model initialization and validation complete")
 
         except Exception as e:
             logger.error(f"Error initializing model: {str(e)}")
             raise
 
-    async def _get_bert_sentiment(self, text: str) -> Dict[str, Any]:
-        """Get BERT sentiment analysis results."""
+    def _selfcheck(self) -> List[int]:
+        """Log the model's predictions for three reference texts to verify the label mapping."""
+        # FinBERT's output mapping: 0=negative (bearish), 1=neutral, 2=positive (bullish)
+        test_texts = [
+            "Strong buy signal with increasing volume",  # Should be bullish
+            "Market showing significant weakness",       # Should be bearish
+            "Price consolidating in range"              # Should be neutral
+        ]
+
+        # One padded forward pass and a single device-to-host copy for all prompts
+        inputs = self.tokenizer(
+            test_texts,
+            return_tensors="pt",
+            truncation=True,
+            max_length=512,
+            padding=True
+        ).to(self.device)
+        with torch.inference_mode():
+            predictions = torch.argmax(self.model(**inputs).logits, dim=1).tolist()
+
+        for text, prediction in zip(test_texts, predictions):
+            logger.info(f"Test prediction for '{text}': {prediction}")
+        return predictions
+
+    @staticmethod
+    def _text_key(text: str) -> bytes:
+        """Cache key for a text's component results."""
+        return hashlib.sha1(text.encode('utf-8')).digest()
+
+    def _cache_get(self, cache: OrderedDict, key: bytes) -> Any:
+        """Return a cached value and mark it most recently used, or None on a miss."""
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+    def _cache_put(self, cache: OrderedDict, key: bytes, value: Any) -> None:
+        """Cache a value, evicting the least recently used entry beyond cache_size."""
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+    async def _submit_bert(self, text: str) -> Tuple[float, float]:
+        """Queue a text for the next batched BERT forward pass and await its scores."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending_bert.append((text, future))
+        if len(self._pending_bert) >= self.max_batch_size:
+            self._flush_bert_batch()
+        elif self._bert_flush_handle is None:
+            self._bert_flush_handle = loop.call_later(self.max_batch_delay, self._flush_bert_batch)
+        return await future
+
+    def _flush_bert_batch(self) -> None:
+        """Start a forward pass over every queued text."""
+        if self._bert_flush_handle is not None:
+            self._bert_flush_handle.cancel()
+            self._bert_flush_handle = None
+        batch, self._pending_bert = self._pending_bert, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run_bert_batch(batch))
+            self._bert_batches.add(task)
+            task.add_done_callback(self._bert_batches.discard)
+
+    async def _run_bert_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Score a batch in a worker thread and resolve each request's future."""
+        try:
+            scores = await asyncio.to_thread(
+                self.sentiment_analyzer._get_bert_sentiments,
+                [text for text, _ in batch],
+                self.max_batch_size
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, scores):
+            if future.done():  # the caller may have been cancelled
+                continue
+            if result is None:
+                future.set_exception(RuntimeError("BERT batch failed"))
+            else:
+                future.set_result(result)
+
+    async def _get_bert_sentiment(
+        self,
+        text: str,
+        bert_scores: Optional[Tuple[float, float]] = None
+    ) -> Dict[str, Any]:
+        """Get BERT sentiment analysis results, reusing precomputed scores if given."""
         try:
-            sentiment_score, confidence = await self.sentiment_analyzer._get_bert_sentiment(text)
+            if bert_scores is None:
+                key = self._text_key(text)
+                bert_scores = self._cache_get(self._bert_cache, key)
+                if bert_scores is None:
+                    bert_scores = await self._submit_bert(text)
+                    self._cache_put(self._bert_cache, key, bert_scores)
+            sentiment_score, confidence = bert_scores
 
             # Map sentiment score to categorical sentiment with wider thresholds
             if sentiment_score > 0.2:  # Less strict threshold for bullish
@@ -167,57 +322,37 @@ class EnsembleSentimentAnalyzer:
                 'score': 0.0
             }
 
-    async def _apply_technical_rules(self, text: str) -> Dict[str, Any]:
-        """Apply technical analysis rules to identify patterns and signals."""
+    async def _apply_technical_rules(self, text: str, text_lower: Optional[str] = None) -> Dict[str, Any]:
+        """Apply technical analysis rules to identify patterns and signals.
+
+        Args:
+            text: Text to analyze
+            text_lower: Optional text.lower() already computed by the caller
+        """
         try:
+            key = self._text_key(text)
+            cached = self._cache_get(self._technical_cache, key)
+            if cached is not None:
+                return cached
+
             # Initialize pattern scores
             bullish_score = 0.0
             bearish_score = 0.0
             pattern_count = 0
 
-            # Define technical patterns with weights
-            bullish_patterns = {
-                'golden cross': 0.9,
-                'breakout': 0.8,
-                'support': 0.7,
-                'strong volume': 0.7,
-                'accumulation': 0.6,
-                'higher low': 0.6,
-                'uptrend': 0.8,
-                'double bottom': 0.8,
-                'bullish divergence': 0.7,
-                'oversold': 0.6
-            }
-
-            bearish_patterns = {
-                'death cross': 0.9,
-                'resistance': 0.7,
-                'breakdown': 0.8,
-                'weak volume': 0.7,
-                'distribution': 0.6,
-                'lower high': 0.6,
-                'downtrend': 0.8,
-                'double top': 0.8,
-                'bearish divergence': 0.7,
-                'overbought': 0.6
-            }
-
-            # Convert text to lowercase for pattern matching
-            text_lower = text.lower()
-
-            # Check for bullish patterns
-            for pattern, weight in bullish_patterns.items():
-                if pattern in text_lower:
+            # Check every pattern against the lowercased text once
+            if text_lower is None:
+                text_lower = text.lower()
+            for pattern, weight, is_bullish in self._TECHNICAL_PATTERNS:
+                if pattern not in text_lower:
+                    continue
+                if is_bullish:
                     bullish_score += weight
-                    pattern_count += 1
-                    logger.info(f"Found bullish pattern: {pattern}, weight: {weight}")
-
-            # Check for bearish patterns
-            for pattern, weight in bearish_patterns.items():
-                if pattern in text_lower:
+                else:
                     bearish_score += weight
-                    pattern_count += 1
-                    logger.info(f"Found bearish pattern: {pattern}, weight: {weight}")
+                pattern_count += 1
+                logger.debug("Found %s pattern: %s, weight: %s",
+                             'bullish' if is_bullish else 'bearish', pattern, weight)
 
             # Calculate final sentiment and confidence
             total_score = bullish_score + bearish_score
@@ -246,10 +381,10 @@ class EnsembleSentimentAnalyzer:
                     sentiment = 'neutral'
                     confidence = 0.25  # Low confidence when no clear direction
 
-            logger.info(f"Technical analysis - Sentiment: {sentiment}, Confidence: {confidence}")
-            logger.info(f"Pattern scores - Bullish: {bullish_score}, Bearish: {bearish_score}")
+            logger.debug("Technical analysis - Sentiment: %s, Confidence: %s", sentiment, confidence)
+            logger.debug("Pattern scores - Bullish: %s, Bearish: %s", bullish_score, bearish_score)
 
-            return {
+            result = {
                 'sentiment': sentiment,
                 'confidence': confidence,
                 'details': {
@@ -258,59 +393,42 @@ class EnsembleSentimentAnalyzer:
                     'pattern_count': pattern_count
                 }
             }
+            self._cache_put(self._technical_cache, key, result)
+            return result
 
         except Exception as e:
             logger.error(f"Error in technical rules analysis: {str(e)}")
             return {'sentiment': 'neutral', 'confidence': self.min_confidence}
 
-    async def _analyze_market_context(self, text: str) -> Dict[str, Any]:
-        """Analyze market context and institutional activity."""
+    async def _analyze_market_context(self, text: str, text_lower: Optional[str] = None) -> Dict[str, Any]:
+        """Analyze market context and institutional activity.
+
+        Args:
+            text: Text to analyze
+            text_lower: Optional text.lower() already computed by the caller
+        """
         try:
+            key = self._text_key(text)
+            cached = self._cache_get(self._market_cache, key)
+            if cached is not None:
+                return cached
+
             # Initialize scores
             bullish_score = 0.0
             bearish_score = 0.0
             context_count = 0
 
-            # Market context indicators with weights
-            bullish_indicators = {
-                'institutional buying': 0.9,
-                'accumulation': 0.8,
-                'strong demand': 0.8,
-                'market cycle bottom': 0.9,
-                'oversold': 0.7,
-                'higher low': 0.7,
-                'support level': 0.7,
-                'bullish divergence': 0.8,
-                'increasing volume': 0.7,
-                'market strength': 0.7
-            }
-
-            bearish_indicators = {
-                'institutional selling': 0.9,
-                'distribution': 0.8,
-                'weak demand': 0.8,
-                'market cycle top': 0.9,
-                'overbought': 0.7,
-                'lower high': 0.7,
-                'resistance level': 0.7,
-                'bearish divergence': 0.8,
-                'decreasing volume': 0.7,
-                'market weakness': 0.7
-            }
-
-            text_lower = text.lower()
-
-            # Check for bullish indicators
-            for indicator, weight in bullish_indicators.items():
-                if indicator in text_lower:
+            # Check every indicator against the lowercased text once
+            if text_lower is None:
+                text_lower = text.lower()
+            for indicator, weight, is_bullish in self._MARKET_INDICATORS:
+                if indicator not in text_lower:
+                    continue
+                if is_bullish:
                     bullish_score += weight
-                    context_count += 1
-
-            # Check for bearish indicators
-            for indicator, weight in bearish_indicators.items():
-                if indicator in text_lower:
+                else:
                     bearish_score += weight
-                    context_count += 1
+                context_count += 1
 
             # Calculate final sentiment and confidence
             total_score = bullish_score + bearish_score
@@ -339,7 +457,7 @@ class EnsembleSentimentAnalyzer:
                     sentiment = 'neutral'
                     confidence = 0.25  # Low confidence when no clear direction
 
-            return {
+            result = {
                 'sentiment': sentiment,
                 'confidence': confidence,
                 'details': {
@@ -348,18 +466,80 @@ class EnsembleSentimentAnalyzer:
                     'context_count': context_count
                 }
             }
+            self._cache_put(self._market_cache, key, result)
+            return result
 
         except Exception as e:
             logger.error(f"Error in market context analysis: {str(e)}")
             return {'sentiment': 'neutral', 'confidence': self.min_confidence}
 
-    async def analyze_sentiment(self, text: str) -> Dict[str, Any]:
-        """Analyze sentiment using ensemble of methods."""
+    async def _run_components(self, components: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Await component analyses concurrently, substituting a neutral vote for any that raise."""
+        results = await asyncio.gather(*components.values(), return_exceptions=True)
+        votes = {}
+        for name, result in zip(components, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error in {name} component analysis: {str(result)}")
+                result = {'sentiment': 'neutral', 'confidence': self.min_confidence}
+            votes[name] = result
+        return votes
+
+    def _agreement_result(
+        self,
+        bert_result: Dict[str, Any],
+        technical_result: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Direct result when BERT and technical rules agree with high confidence, else None."""
+        if bert_result['sentiment'] != technical_result['sentiment']:
+            return None
+        if min(bert_result['confidence'], technical_result['confidence']) <= self.high_confidence:
+            return None
+        return {
+            'sentiment': bert_result['sentiment'],
+            'confidence': min(0.95, 0.5 * bert_result['confidence'] + 0.5 * technical_result['confidence'] + 0.1),
+            'components': {
+                'bert': bert_result,
+                'technical': technical_result
+            }
+        }
+
+    async def analyze_sentiment(
+        self,
+        text: str,
+        bert_scores: Optional[Tuple[float, float]] = None
+    ) -> Dict[str, Any]:
+        """Analyze sentiment using ensemble of methods.
+
+        Args:
+            text: Text to analyze
+            bert_scores: Optional precomputed (score, confidence) from a batched BERT pass
+
+        Returns:
+            Dict with the fused sentiment, confidence and per-component results
+        """
         try:
-            # Get sentiment from each component
-            bert_result = await self._get_bert_sentiment(text)
-            technical_result = await self._apply_technical_rules(text)
-            market_result = await self._analyze_market_context(text)
+            # Get sentiment from each component; the rule scans run while the
+            # BERT forward pass is off the event loop
+            text_lower = text.lower()
+            components = {
+                'bert': self._get_bert_sentiment(text, bert_scores),
+                'technical': self._apply_technical_rules(text, text_lower)
+            }
+            if not self.agreement_fast_path:
+                components['market'] = self._analyze_market_context(text, text_lower)
+            results = await self._run_components(components)
+
+            if self.agreement_fast_path:
+                # Strong BERT/technical agreement decides the vote without market context
+                agreed = self._agreement_result(results['bert'], results['technical'])
+                if agreed is not None:
+                    return agreed
+                results.update(await self._run_components({
+                    'market': self._analyze_market_context(text, text_lower)
+                }))
+            bert_result, technical_result, market_result = (
+                results['bert'], results['technical'], results['market']
+            )
 
             # Extract individual sentiments and confidences
             sentiments = {
@@ -373,12 +553,11 @@ class EnsembleSentimentAnalyzer:
                 'market': market_result['confidence']
             }
 
-            # Initialize sentiment scores
-            sentiment_scores = {
-                'bullish': 0.0,
-                'bearish': 0.0,
-                'neutral': 0.0
-            }
+            # Weighted votes per sentiment, in _SENTIMENTS order
+            scores = [0.0, 0.0, 0.0]
+            sentiment_index = self._SENTIMENT_INDEX
+            technical_sentiment = technical_result['sentiment']
+            technical_confidence = technical_result['confidence']
 
             # Calculate weighted sentiment scores with enhanced technical weighting
             for source, sentiment in sentiments.items():
@@ -393,35 +572,35 @@ class EnsembleSentimentAnalyzer:
                         base_weight *= 1.5  # 50% boost for moderate technical signals
 
                 # Reduce BERT weight when it conflicts with strong technical or market signals
-                if source == 'bert':
-                    if technical_result['confidence'] > 0.8 and sentiment != technical_result['sentiment']:
+                elif source == 'bert':
+                    if technical_confidence > 0.8 and sentiment != technical_sentiment:
                         base_weight *= 0.5  # Reduce BERT weight more aggressively
                     elif market_result['confidence'] > 0.8 and sentiment != market_result['sentiment']:
                         base_weight *= 0.7  # Moderate reduction for market conflicts
 
                 # Apply weighted vote
-                weight = base_weight * confidence
-                sentiment_scores[sentiment] += weight
+                scores[sentiment_index[sentiment]] += base_weight * confidence
 
-            # Normalize scores
-            total_score = sum(sentiment_scores.values())
-            if total_score > 0:
-                sentiment_scores = {k: v/total_score for k, v in sentiment_scores.items()}
+            total = scores[0] + scores[1] + scores[2]
+            if total <= 0:
+                # No component voted with any confidence
+                return {'sentiment': 'neutral', 'confidence': self.min_confidence}
 
-            # Add bias against neutral predictions
-            if max(sentiment_scores.values()) < 0.5:  # No strong signal
+            # Add bias against neutral predictions when no sentiment holds half the vote
+            if max(scores) < 0.5 * total:
                 neutral_penalty = 0.3  # Increased penalty
-                for sentiment in ['bullish', 'bearish']:
-                    sentiment_scores[sentiment] *= (1 + neutral_penalty)
-                total = sum(sentiment_scores.values())
-                sentiment_scores = {k: v/total for k, v in sentiment_scores.items()}
+                scores[0] *= (1 + neutral_penalty)
+                scores[1] *= (1 + neutral_penalty)
+                total = scores[0] + scores[1] + scores[2]
 
-            # Determine final sentiment based on highest weighted score
-            final_sentiment = max(sentiment_scores.items(), key=lambda x: x[1])[0]
+            # Normalize once and pick the highest weighted score
+            scores = [score / total for score in scores]
+            final_index, sentiment_strength = max(enumerate(scores), key=itemgetter(1))
+            final_sentiment = self._SENTIMENTS[final_index]
 
             # Calculate agreement score with higher weight for technical agreement
             agreement_count = sum(1 for s in sentiments.values() if s == final_sentiment)
-            tech_agreement = 1 if technical_result['sentiment'] == final_sentiment else 0
+            tech_agreement = 1 if technical_sentiment == final_sentiment else 0
             agreement_score = (agreement_count + tech_agreement) / (len(sentiments) + 1)
 
             # Calculate confidence with stronger technical weighting
@@ -432,7 +611,6 @@ class EnsembleSentimentAnalyzer:
 
             # Adjust confidence based on agreement and sentiment strength
             agreement_boost = agreement_score * 0.5  # Increased from 0.4
-            sentiment_strength = max(sentiment_scores.values())
             strength_boost = sentiment_strength * 0.4  # Increased from 0.3
 
             final_confidence = min(0.95, base_confidence + agreement_boost + strength_boost)
@@ -440,16 +618,16 @@ class EnsembleSentimentAnalyzer:
             # Reduce confidence for disagreements less aggressively
             if agreement_score < 0.67:  # Less than 2/3 agreement
                 final_confidence *= 0.85  # Changed from 0.8
-            elif sentiment_scores['neutral'] > 0.25:  # Lowered threshold further
+            elif scores[2] > 0.25:  # Neutral share  # Lowered threshold further
                 final_confidence *= 0.9
 
             # Ensure minimum confidence threshold
             final_confidence = max(self.min_confidence, final_confidence)
 
-            logger.info(f"Ensemble analysis - Final: {final_sentiment}, Confidence: {final_confidence}")
-            logger.info(f"Component sentiments: {sentiments}")
-            logger.info(f"Component confidences: {confidences}")
-            logger.info(f"Sentiment scores: {sentiment_scores}")
+            logger.info("Ensemble analysis - Final: %s, Confidence: %s", final_sentiment, final_confidence)
+            logger.debug("Component sentiments: %s", sentiments)
+            logger.debug("Component confidences: %s", confidences)
+            logger.debug("Sentiment scores (bullish, bearish, neutral): %s", scores)
 
             return {
                 'sentiment': final_sentiment,
@@ -464,3 +642,39 @@ class EnsembleSentimentAnalyzer:
         except Exception as e:
             logger.error(f"Error in ensemble sentiment analysis: {str(e)}")
             return {'sentiment': 'neutral', 'confidence': self.min_confidence}
+
+    async def analyze_sentiment_batch(self, texts: List[str], batch_size: int = 32) -> List[Dict[str, Any]]:
+        """Analyze many texts with one BERT forward pass per batch.
+
+        The rule-based components are cheap string scans, so they still run per
+        text and are fused with the batched BERT scores exactly as in
+        analyze_sentiment.
+
+        Args:
+            texts: Texts to analyze
+            batch_size: Maximum number of texts per model forward pass
+
+        Returns:
+            List of ensemble results in the same order as texts
+        """
+        # Only distinct texts missing from the BERT cache go through the model
+        bert_scores = {
+            text: self._cache_get(self._bert_cache, self._text_key(text))
+            for text in dict.fromkeys(texts)
+        }
+        missing = [text for text, scores in bert_scores.items() if scores is None]
+        if missing:
+            computed = await asyncio.to_thread(
+                self.sentiment_analyzer._get_bert_sentiments, missing, batch_size
+            )
+            for text, scores in zip(missing, computed):
+                if scores is None:
+                    # Failed batch: vote neutral this time but leave it uncached
+                    bert_scores[text] = (0.0, self.sentiment_analyzer.min_confidence)
+                    continue
+                bert_scores[text] = scores
+                self._cache_put(self._bert_cache, self._text_key(text), scores)
+
+        return [await self.analyze_sentiment(text, bert_scores[text]) for text in texts]
+
+    batch_analyze = analyze_sentiment_batch
@@ -0,0 +1,44 @@
+"""Export FinBERT to an INT8-quantized ONNX model for CPU inference.
+
+EnglishSentimentAnalyzer serves models/finbert_onnx through ONNX Runtime when no
+GPU is available. Requires the optimum[onnxruntime] extra.
+
+INT8 weights shift FinBERT's probabilities slightly, so labels can differ from the
+fp32 model on borderline texts. Serving the export is therefore opt-in: the default
+CPU path stays fp32 PyTorch unless this script has been run.
+"""
+import os
+import logging
+import tempfile
+from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from transformers import AutoTokenizer
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def export_finbert(output_dir: str, model_name: str = "ProsusAI/finbert") -> str:
+    """Export the model to ONNX, quantize it dynamically to INT8 and save it with its tokenizer."""
+    logger.info(f"Exporting {model_name} to ONNX...")
+    model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+
+    with tempfile.TemporaryDirectory() as export_dir:
+        model.save_pretrained(export_dir)
+
+        # Dynamic quantization needs no calibration data; weights become INT8
+        logger.info("Quantizing ONNX model to INT8...")
+        quantizer = ORTQuantizer.from_pretrained(export_dir)
+        quantization_config = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+        quantizer.quantize(save_dir=output_dir, quantization_config=quantization_config)
+
+    model.config.save_pretrained(output_dir)
+    tokenizer.save_pretrained(output_dir)
+    logger.info(f"Quantized model saved to {output_dir}")
+    return output_dir
+
+if __name__ == "__main__":
+    export_finbert(os.path.join(os.path.dirname(__file__), '../models/finbert_onnx'))
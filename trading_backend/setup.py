@@ -17,6 +17,8 @@ setup(
         "torch>=2.2.1",
         "jieba>=0.42.1",
         "beautifulsoup4>=4.12.3",
+        "lxml>=5.0.0",
+        "selectolax>=0.3.21",
         "aiohttp>=3.11.10",
         "pytest>=8.3.4",
         "pytest-asyncio>=0.25.0",
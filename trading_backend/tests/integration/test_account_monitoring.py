@@ -1,4 +1,6 @@
 import pytest
+import asyncio
+import time
 from decimal import Decimal
 from app.services.monitoring.account_monitor import AccountMonitor
 from app.services.trading.pair_selector import PairSelector
@@ -150,3 +152,151 @@ async def test_strategy_adaptation(trading_strategy):
             total_size = sum(signal["entry_stages"])
             assert abs(total_size - signal["position_size"]) < 0.0001, \
                 "Sum of staged entries should equal total position size"
+
+@pytest.mark.asyncio
+async def test_entry_conditions_by_direction(trading_strategy):
+    """Test staged entry prices scale in on dips for longs and bounces for shorts"""
+    market_data = {"price": 50000, "volatility": 0.02}
+
+    long_conditions = trading_strategy._generate_entry_conditions("BTC/USDT", "long", market_data)
+    short_conditions = trading_strategy._generate_entry_conditions("BTC/USDT", "short", market_data)
+
+    assert [c["price"] for c in long_conditions] == pytest.approx([50000, 49500, 49000])
+    assert [c["price"] for c in short_conditions] == pytest.approx([50000, 50500, 51000])
+    assert [c["type"] for c in long_conditions] == ["market", "limit", "limit"]
+    assert long_conditions[1]["description"] == "First dip buy"
+    assert short_conditions[2]["description"] == "Second bounce sell"
+
+@pytest.mark.asyncio
+async def test_batch_pair_confidence_matches_scalar(trading_strategy):
+    """Test vectorized pair scoring agrees with per-pair scoring"""
+    market_datas = [
+        {
+            "volume_24h": 50_000 * i,
+            "volatility": 0.005 * (i % 30),
+            "liquidity_score": 0.05 * (i % 25)
+        }
+        for i in range(40)
+    ]
+
+    batch = trading_strategy._calculate_pair_confidences(market_datas)
+    scalar = [trading_strategy._calculate_pair_confidence(md) for md in market_datas]
+
+    assert batch == scalar
+    assert trading_strategy._calculate_pair_confidences(market_datas[:3]) == scalar[:3]
+
+@pytest.mark.asyncio
+async def test_confidence_multiplier_bands(trading_strategy):
+    """Test confidence multiplier band boundaries are inclusive"""
+    test_cases = [
+        (0.80, 0.4),
+        (0.85, 0.6),
+        (0.89, 0.6),
+        (0.90, 0.8),
+        (0.95, 1.0),
+        (1.00, 1.0),
+    ]
+
+    for confidence, expected in test_cases:
+        assert trading_strategy._calculate_confidence_multiplier(confidence) == expected
+
+@pytest.mark.asyncio
+async def test_generate_signals_batch(trading_strategy):
+    """Test batch signal generation preserves order and shares one timestamp"""
+    requests = [
+        {"balance": Decimal("500"), "symbol": "BTC/USDT", "signal_type": "long", "confidence": 0.9},
+        {"balance": Decimal("500"), "symbol": "ETH/USDT", "signal_type": "short", "confidence": 0.5},
+        {"balance": Decimal("200000"), "symbol": "BNB/USDT", "signal_type": "short", "confidence": 0.96},
+    ]
+
+    signals = await trading_strategy.generate_signals(requests)
+
+    assert len(signals) == 3
+    assert signals[0]["symbol"] == "BTC/USDT"
+    assert signals[1] is None, "Signal below accuracy threshold should be rejected"
+    assert signals[2]["symbol"] == "BNB/USDT"
+    assert "entry_stages" in signals[2]
+    assert signals[0]["timestamp"] == signals[2]["timestamp"]
+
+    single = await trading_strategy.generate_signal(**requests[0])
+    assert single["position_size"] == signals[0]["position_size"]
+
+    # Batch-priced entry conditions match the single-signal path
+    staged_single = await trading_strategy.generate_signal(**requests[2])
+    assert signals[2]["entry_conditions"] == staged_single["entry_conditions"]
+    assert "entry_conditions" not in signals[0]
+
+@pytest.mark.asyncio
+async def test_select_trading_pairs(trading_strategy):
+    """Test pair selection scores every recommended pair"""
+    base_pairs = ["BTC/USDT", "ETH/USDT", "BNB/USDT", "SOL/USDT"]
+
+    pairs = await trading_strategy.select_trading_pairs(
+        balance=Decimal("2000000"),
+        base_pairs=base_pairs,
+        min_confidence=0.5
+    )
+
+    assert [pair["symbol"] for pair in pairs] == base_pairs
+    assert all(pair["confidence"] >= 0.5 for pair in pairs)
+
+@pytest.mark.asyncio
+async def test_market_data_cache_shares_fetches(account_monitor, pair_selector):
+    """Test concurrent and repeated lookups within the TTL share one fetch"""
+    class CountingMarketDataService:
+        def __init__(self):
+            self.calls = 0
+
+        async def get_market_data(self, symbol: str) -> dict:
+            self.calls += 1
+            await asyncio.sleep(0.01)
+            return {"symbol": symbol, "volume_24h": 1_000_000}
+
+    service = CountingMarketDataService()
+    strategy = TradingStrategy(account_monitor, pair_selector, service, market_data_ttl=60)
+
+    results = await asyncio.gather(*(strategy._get_market_data("BTC/USDT") for _ in range(5)))
+    await strategy._get_market_data("BTC/USDT")
+    many = await strategy._get_market_data_many(["BTC/USDT", "ETH/USDT"])
+
+    assert all(result["symbol"] == "BTC/USDT" for result in results)
+    assert [md["symbol"] for md in many] == ["BTC/USDT", "ETH/USDT"]
+    assert service.calls == 2
+
+    strategy.market_data_ttl = 0
+    await strategy._get_market_data("BTC/USDT")
+    assert service.calls == 3
+
+@pytest.mark.asyncio
+async def test_market_data_fetch_survives_cancelled_caller(account_monitor, pair_selector):
+    """Test cancelling one waiter leaves the shared fetch running for the others"""
+    class SlowMarketDataService:
+        def __init__(self):
+            self.calls = 0
+
+        async def get_market_data(self, symbol: str) -> dict:
+            self.calls += 1
+            await asyncio.sleep(0.05)
+            return {"symbol": symbol, "volume_24h": 1_000_000}
+
+    service = SlowMarketDataService()
+    strategy = TradingStrategy(account_monitor, pair_selector, service, market_data_ttl=60)
+
+    cancelled = asyncio.ensure_future(strategy._get_market_data("BTC/USDT"))
+    survivor = asyncio.ensure_future(strategy._get_market_data("BTC/USDT"))
+    await asyncio.sleep(0.01)
+    cancelled.cancel()
+
+    assert (await survivor)["symbol"] == "BTC/USDT"
+    assert cancelled.cancelled()
+    assert (await strategy._get_market_data("BTC/USDT"))["symbol"] == "BTC/USDT"
+    assert service.calls == 1
+
+    # A fetch that is itself cancelled is evicted rather than served for the whole TTL
+    fetch = asyncio.ensure_future(service.get_market_data("BTC/USDT"))
+    fetch.cancel()
+    strategy._market_data_cache["BTC/USDT"] = (time.monotonic(), fetch)
+    with pytest.raises(asyncio.CancelledError):
+        await strategy._get_market_data("BTC/USDT")
+    assert "BTC/USDT" not in strategy._market_data_cache
+    assert (await strategy._get_market_data("BTC/USDT"))["symbol"] == "BTC/USDT"
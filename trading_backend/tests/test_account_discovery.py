@@ -1,4 +1,6 @@
 import pytest
+import asyncio
+import threading
 from unittest.mock import Mock, patch, AsyncMock
 from datetime import datetime, timedelta
 from app.services.web_scraping.account_discovery import AccountDiscovery, RateLimiter
@@ -45,6 +47,17 @@ def create_mock_twitter_user(
     user.url = "https://example.com" if followers_count > 100000 else None
     return user
 
+def paginate(method, *pages):
+    """Make a mocked tweepy API method serve the given user pages via tweepy.Cursor"""
+    method.pagination_mode = 'cursor'
+
+    def fetch(cursor, **kwargs):
+        index = 0 if cursor == -1 else cursor
+        next_cursor = index + 1 if index + 1 < len(pages) else 0
+        return (list(pages[index]) if pages else []), (index, next_cursor)
+
+    method.side_effect = fetch
+
 @pytest.mark.asyncio
 async def test_discover_twitter_accounts(discovery, mock_twitter_api):
     # Mock influential trader accounts
@@ -75,8 +88,8 @@ async def test_discover_twitter_accounts(discovery, mock_twitter_api):
         verified=False
     )
 
-    mock_twitter_api.return_value.get_followers.return_value = [trader1, non_influential]
-    mock_twitter_api.return_value.get_friends.return_value = [trader2]
+    paginate(mock_twitter_api.return_value.get_followers, [trader1, non_influential])
+    paginate(mock_twitter_api.return_value.get_friends, [trader2])
 
     discovered = await discovery._discover_twitter_accounts(['seed_account'])
 
@@ -92,6 +105,58 @@ async def test_discover_twitter_accounts(discovery, mock_twitter_api):
         assert metrics['activity_rate'] >= 0.5
         assert metrics['verified'] is True
 
+@pytest.mark.asyncio
+async def test_discover_twitter_accounts_isolates_seed_errors(discovery, mock_twitter_api):
+    trader = create_mock_twitter_user(
+        "Crypto Analyst",
+        "Professional crypto trader and technical analysis expert. #Bitcoin #Trading",
+        followers_count=100000,
+        friends_count=1000,
+        statuses_count=5000,
+        verified=True,
+        created_at=datetime.now() - timedelta(days=730)
+    )
+
+    def get_followers(cursor, screen_name, count):
+        if screen_name == 'broken_seed':
+            raise Exception("API error")
+        return [trader], (0, 0)
+
+    mock_twitter_api.return_value.get_followers.pagination_mode = 'cursor'
+    mock_twitter_api.return_value.get_followers.side_effect = get_followers
+    paginate(mock_twitter_api.return_value.get_friends)
+
+    discovered = await discovery._discover_twitter_accounts(['broken_seed', 'good_seed'])
+
+    assert len(discovered) == 1
+    assert discovered[0]['username'] == 'crypto_analyst'
+    assert discovered[0]['seed_account'] == 'good_seed'
+
+@pytest.mark.asyncio
+async def test_discover_twitter_accounts_deduplicates_users(discovery, mock_twitter_api):
+    trader = create_mock_twitter_user(
+        "Crypto Analyst",
+        "Professional crypto trader and technical analysis expert. #Bitcoin #Trading",
+        followers_count=100000,
+        friends_count=1000,
+        statuses_count=5000,
+        verified=True,
+        created_at=datetime.now() - timedelta(days=730)
+    )
+
+    paginate(mock_twitter_api.return_value.get_followers, [trader])
+    paginate(mock_twitter_api.return_value.get_friends, [trader])
+
+    with patch.object(discovery, '_is_influential_trader', wraps=discovery._is_influential_trader) as check:
+        discovered = await discovery._discover_twitter_accounts(['seed_a', 'seed_b'])
+        assert len(discovered) == 1
+        assert check.call_count == 1
+
+        # A later pass within the cache window reuses the earlier verdict
+        discovered = await discovery._discover_twitter_accounts(['seed_a'])
+        assert [acc['username'] for acc in discovered] == ['crypto_analyst']
+        assert check.call_count == 1
+
 @pytest.mark.asyncio
 async def test_discover_youtube_channels(discovery, mock_youtube_client):
     # Mock YouTube API responses
@@ -137,6 +202,51 @@ async def test_discover_youtube_channels(discovery, mock_youtube_client):
     assert 'Professional Trading Analysis' in discovered
     assert 'Institutional Crypto Trading' in discovered
 
+@pytest.mark.asyncio
+async def test_discover_twitter_accounts_stops_paging_early(discovery, mock_twitter_api):
+    def trader(i):
+        user = create_mock_twitter_user(
+            f"Crypto Analyst {i}",
+            "Professional crypto trader and technical analysis expert. #Bitcoin #Trading",
+            followers_count=100000,
+            friends_count=1000,
+            statuses_count=5000,
+            verified=True,
+            created_at=datetime.now() - timedelta(days=730)
+        )
+        user.id = i
+        return user
+
+    followers = mock_twitter_api.return_value.get_followers
+    paginate(followers, [trader(i) for i in range(8)], [trader(i) for i in range(8, 16)],
+             [trader(i) for i in range(16, 24)])
+    paginate(mock_twitter_api.return_value.get_friends)
+
+    discovered = await discovery._discover_twitter_accounts(['seed_account'])
+
+    assert len(discovered) == discovery._TWITTER_MAX_CANDIDATES_PER_SOURCE
+    assert followers.call_count == 2
+    assert followers.call_args.kwargs['count'] == discovery._TWITTER_PAGE_SIZE
+
+@pytest.mark.asyncio
+async def test_list_channels_batches_ids():
+    with patch('app.services.web_scraping.account_discovery.build') as mock_build:
+        discovery = AccountDiscovery(youtube_api_key='test_youtube_key')
+        youtube = mock_build.return_value
+        youtube.channels().list().execute.side_effect = [
+            {'items': [{'id': f'c{i}'} for i in range(50)]},
+            {'items': [{'id': f'c{i}'} for i in range(50, 60)]}
+        ]
+        youtube.channels().list.reset_mock()
+
+        channel_ids = [f'c{i}' for i in range(60)] + ['c0', 'c1']
+        items = await discovery._list_channels(channel_ids, 'snippet')
+
+    assert len(items) == 60
+    assert youtube.channels().list.call_count == 2
+    requested = [call.kwargs['id'].split(',') for call in youtube.channels().list.call_args_list]
+    assert [len(ids) for ids in requested] == [50, 10]
+
 @pytest.mark.asyncio
 async def test_rate_limiter():
     limiter = RateLimiter(max_requests=2, time_window=1)
@@ -153,6 +263,17 @@ async def test_rate_limiter():
     total_duration = (datetime.now() - start_time).total_seconds()
     assert total_duration >= 1.0
 
+@pytest.mark.asyncio
+async def test_rate_limiter_concurrent_callers():
+    limiter = RateLimiter(max_requests=2, time_window=0.5)
+
+    # Concurrent callers must not slip past the limit together
+    start_time = datetime.now()
+    await asyncio.gather(*(limiter.acquire() for _ in range(3)))
+    total_duration = (datetime.now() - start_time).total_seconds()
+    assert total_duration >= 0.5
+    assert len(limiter.requests) == 2
+
 @pytest.mark.asyncio
 async def test_influential_trader_detection(discovery):
     # Test highly influential verified trader
@@ -223,3 +344,106 @@ async def test_trader_metrics(discovery):
     assert metrics['avg_tweets_per_day'] > 7  # Approximately 8000/1095
     assert metrics['listed_count'] == 1500
     assert metrics['has_website'] is True
+
+@pytest.mark.asyncio
+async def test_find_related_accounts_runs_platforms_concurrently(discovery):
+    async def slow_twitter(seed_accounts):
+        await asyncio.sleep(0.2)
+        return [{'username': 'trader'}]
+
+    async def slow_youtube(seed_accounts):
+        await asyncio.sleep(0.2)
+        return {'Trading Channel'}
+
+    with patch.object(discovery, '_discover_twitter_accounts', side_effect=slow_twitter), \
+            patch.object(discovery, '_discover_youtube_channels', side_effect=slow_youtube):
+        start_time = datetime.now()
+        discovered = await discovery.find_related_accounts(['seed_account'])
+        duration = (datetime.now() - start_time).total_seconds()
+
+    assert discovered == {'twitter': [{'username': 'trader'}], 'youtube': {'Trading Channel'}}
+    assert duration < 0.35
+
+@pytest.mark.asyncio
+async def test_find_related_accounts_without_clients():
+    discovered = await AccountDiscovery().find_related_accounts(['seed_account'])
+    assert discovered == {'twitter': [], 'youtube': []}
+
+@pytest.mark.asyncio
+async def test_find_related_accounts_persists_cache(tmp_path):
+    discovery = AccountDiscovery(cache_dir=str(tmp_path))
+    discovery.twitter_client = Mock()
+    discover = AsyncMock(return_value=[{'username': 'trader'}])
+
+    with patch.object(discovery, '_discover_twitter_accounts', discover):
+        first = await discovery.find_related_accounts(['seed_a', 'seed_b'])
+        again = await discovery.find_related_accounts(['seed_b', 'seed_a'])
+    assert first == again
+    assert discover.await_count == 1
+    assert len(list(tmp_path.glob('*.json'))) == 1
+
+    # A fresh instance warm-starts from disk without calling the APIs
+    restarted = AccountDiscovery(cache_dir=str(tmp_path))
+    restarted.twitter_client = Mock()
+    discover = AsyncMock(return_value=[])
+    with patch.object(restarted, '_discover_twitter_accounts', discover):
+        cached = await restarted.find_related_accounts(['seed_a', 'seed_b'])
+    assert cached == first
+    assert discover.await_count == 0
+
+    # Expired entries are rediscovered
+    restarted.cache_duration = timedelta(0)
+    with patch.object(restarted, '_discover_twitter_accounts', discover):
+        await restarted.find_related_accounts(['seed_a', 'seed_b'])
+    assert discover.await_count == 1
+
+@pytest.mark.asyncio
+async def test_instances_share_sdk_executor():
+    names = [
+        await discovery._run_blocking(lambda: threading.current_thread().name)
+        for discovery in (AccountDiscovery(), AccountDiscovery())
+    ]
+    assert all(name.startswith('account-discovery') for name in names)
+    assert not hasattr(AccountDiscovery(), '_executor')
+
+def test_scored_users_bounded():
+    discovery = AccountDiscovery()
+    discovery._SCORED_USERS_MAX = 3
+    now = datetime.now()
+    discovery._remember_score(1, now - timedelta(hours=7), None)
+    discovery._remember_score(2, now, None)
+    assert list(discovery._scored_users) == [2]  # expired verdict dropped
+
+    for user_id in range(3, 7):
+        discovery._remember_score(user_id, now, None)
+    assert list(discovery._scored_users) == [4, 5, 6]
+
+@pytest.mark.asyncio
+async def test_find_related_accounts_locks_per_seed_set(tmp_path):
+    discovery = AccountDiscovery(cache_dir=str(tmp_path))
+    discovery.twitter_client = Mock()
+    discovery.youtube_client = Mock()
+    release = asyncio.Event()
+
+    async def slow_discover(seeds):
+        if seeds == ['slow']:
+            await release.wait()
+        return [{'username': seeds[0]}]
+
+    with patch.object(discovery, '_discover_twitter_accounts', side_effect=slow_discover), \
+         patch.object(discovery, '_discover_youtube_channels', AsyncMock(return_value={'chan_b', 'chan_a'})):
+        slow = asyncio.create_task(discovery.find_related_accounts(['slow']))
+        await asyncio.sleep(0)
+        fast = await asyncio.wait_for(discovery.find_related_accounts(['fast']), timeout=1)
+        release.set()
+        await slow
+
+    assert fast['twitter'] == [{'username': 'fast'}]
+
+    # The JSON cache round-trips the channel set
+    restarted = AccountDiscovery(cache_dir=str(tmp_path))
+    restarted.twitter_client = Mock()
+    restarted.youtube_client = Mock()
+    cached = await restarted.find_related_accounts(['fast'])
+    assert cached == fast
+    assert cached['youtube'] == {'chan_a', 'chan_b'}
@@ -5,6 +5,7 @@ Tests for Chinese platform scraping and sentiment analysis.
 import pytest
 import logging
 import asyncio
+from unittest.mock import AsyncMock, patch
 from app.services.web_scraping.chinese_scraper import ChineseScraper
 
 # Configure logging
@@ -74,3 +75,60 @@ class TestChinesePlatforms:
         except Exception as e:
             logger.error(f"Test failed with error: {str(e)}")
             raise
+
+    @pytest.mark.asyncio
+    async def test_scrape_platform_fetches_keywords_concurrently(self, chinese_scraper):
+        """Keyword searches overlap, keep keyword order and skip failed keywords."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fetch(session, semaphore, platform, keyword):
+            nonlocal in_flight, max_in_flight
+            async with semaphore:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+            if keyword == '熊市':
+                raise RuntimeError("connection reset")
+            return [{'platform': platform, 'content': keyword}]
+
+        async with chinese_scraper:
+            with patch.object(chinese_scraper, '_fetch_search_results', side_effect=fetch):
+                results = await chinese_scraper.scrape_platform('weibo', ['比特币', '熊市', '牛市'])
+        assert chinese_scraper.session is None
+
+        assert [r['content'] for r in results] == ['比特币', '牛市']
+        assert max_in_flight == 3
+
+    def test_parse_content_extracts_platform_posts(self, chinese_scraper):
+        """Only the platform's post containers are parsed, including multi-class ones."""
+        html = """
+        <html><body>
+            <div class="nav"><p class="txt">导航</p></div>
+            <div class="card-wrap feed-item" action-type="feed_list_item"><p class="txt"> 比特币突破新高 </p></div>
+            <div class="card-wrap"><p class="txt">市场看空</p></div>
+            <div class="List-item"><span class="RichText">知乎回答</span></div>
+        </body></html>
+        """
+
+        weibo_posts = chinese_scraper._parse_content('weibo', html)
+        assert [post['content'] for post in weibo_posts] == ['比特币突破新高', '市场看空']
+        assert all(post['platform'] == 'weibo' for post in weibo_posts)
+
+        zhihu_posts = chinese_scraper._parse_content('zhihu', html)
+        assert [post['content'] for post in zhihu_posts] == ['知乎回答']
+
+    @pytest.mark.asyncio
+    async def test_sentiment_analyzer_loaded_once(self, chinese_scraper):
+        """Concurrent first calls share a single model load."""
+        analyzer = AsyncMock()
+        analyzer.analyze_text.return_value = (0.0, 0.9)
+
+        with patch('app.services.web_scraping.sentiment_analyzer.SentimentAnalyzer.instance',
+                   return_value=analyzer) as factory:
+            await asyncio.gather(*(chinese_scraper.analyze_sentiment("牛市来临") for _ in range(3)))
+
+        factory.assert_called_once_with('chinese')
+        assert chinese_scraper.sentiment_analyzer is analyzer
+        assert analyzer.analyze_text.await_count == 3
@@ -3,7 +3,7 @@ import pytest
 import aiohttp
 from datetime import datetime
 from unittest.mock import patch, MagicMock, AsyncMock
-from app.services.web_scraping.content_extractor import ContentExtractor, RateLimiter
+from app.services.web_scraping.content_extractor import ContentExtractor, RateLimiter, read_text_limited
 
 @pytest.fixture
 def mock_response():
@@ -109,3 +109,87 @@ async def test_content_extractor_batch():
             assert len(results) == 3
             assert all(isinstance(result, dict) for result in results)
             assert mock_extract.call_count == 3
+
+@pytest.mark.asyncio
+async def test_rate_limiter_concurrent_callers():
+    limiter = RateLimiter(calls=2, period=0.5)
+
+    start = asyncio.get_running_loop().time()
+    await asyncio.gather(*(limiter.acquire() for _ in range(3)))
+    elapsed = asyncio.get_running_loop().time() - start
+
+    # Concurrent callers must not race past the limit
+    assert elapsed >= 0.45
+    assert len(limiter.timestamps) == 2
+
+@pytest.mark.asyncio
+async def test_content_extractor_batch_slow_url_does_not_block():
+    completed = []
+
+    async def extract(url):
+        await asyncio.sleep(0.2 if url.endswith("/0") else 0.01)
+        completed.append(url)
+        return {"content": url, "success": True, "source": "test"}
+
+    async with ContentExtractor() as extractor:
+        with patch.object(extractor, 'extract_content', side_effect=extract):
+            urls = [f"https://example.com/{i}" for i in range(5)]
+            results = await extractor.extract_batch(urls, concurrency=2)
+
+    # The other worker drains the queue while the slow URL is in flight
+    assert completed[-1] == "https://example.com/0"
+    assert [result["content"] for result in results] == urls
+
+async def async_chunks(chunks):
+    for chunk in chunks:
+        yield chunk
+
+@pytest.mark.asyncio
+async def test_read_text_limited():
+    response = MagicMock()
+    response.content_length = None
+    response.charset = 'gbk'
+    response.content.iter_chunked.return_value = async_chunks(["比特币".encode('gbk'), b"x" * 10])
+    assert await read_text_limited(response, max_bytes=8) == "比特币xx"
+
+    response.content_length = 9
+    with pytest.raises(ValueError):
+        await read_text_limited(response, max_bytes=8)
+
+@pytest.mark.asyncio
+async def test_content_extractor_retries_rate_limited_jina():
+    limited = AsyncMock()
+    limited.status = 429
+    limited.headers = {"Retry-After": "0"}
+    ok = MagicMock()
+    ok.status = 200
+    ok.content_length = None
+    ok.charset = 'utf-8'
+    ok.content.iter_chunked.return_value = async_chunks([b"Jina ", b"content"])
+
+    contexts = []
+    for response in (limited, ok):
+        context = AsyncMock()
+        context.__aenter__.return_value = response
+        contexts.append(context)
+
+    mock_session = MagicMock()
+    mock_session.get.side_effect = contexts
+
+    async with ContentExtractor() as extractor:
+        await extractor.session.close()
+        extractor.session = mock_session
+        with patch('trafilatura.fetch_url') as mock_fetch:
+            result = await extractor.extract_content("https://example.com")
+
+    assert result["success"] is True
+    assert result["source"] == "jina_reader"
+    assert result["content"] == "Jina content"
+    assert mock_session.get.call_count == 2
+    mock_fetch.assert_not_called()
+
+def test_retry_delay():
+    assert ContentExtractor._retry_delay("3", 0) == 3.0
+    assert ContentExtractor._retry_delay(None, 2) == 4.0
+    assert ContentExtractor._retry_delay("Wed, 21 Oct 2015 07:28:00 GMT", 1) == 0.0
+    assert ContentExtractor._retry_delay("soon", 1) == 2.0
@@ -19,6 +19,7 @@ def mock_youtube_client():
 def mock_sentiment_analyzer():
     analyzer = Mock(spec=SentimentAnalyzer)
     analyzer.analyze_text.return_value = 0.75
+    analyzer.analyze_texts.side_effect = lambda texts: [(0.75, 0.9)] * len(texts)
     return analyzer
 
 @pytest.fixture
@@ -55,6 +56,25 @@ async def test_get_twitter_insights(scraper, mock_twitter_api):
     assert insights[0]['platform'] == 'twitter'
     assert insights[0]['content'] == tweet.full_text
     assert insights[0]['sentiment'] == 0.75
+    scraper.sentiment_analyzer.analyze_texts.assert_awaited_once_with([tweet.full_text])
+
+@pytest.mark.asyncio
+async def test_get_twitter_insights_isolates_account_errors(scraper, mock_twitter_api):
+    tweet = Mock()
+    tweet.full_text = "BTC breakout above resistance"
+    tweet.created_at = datetime.now()
+
+    def user_timeline(screen_name, count, tweet_mode):
+        if screen_name == 'suspended_account':
+            raise Exception("User has been suspended")
+        return [tweet]
+
+    mock_twitter_api.return_value.user_timeline.side_effect = user_timeline
+
+    insights = await scraper.get_twitter_insights(['suspended_account', 'crypto_trader'])
+
+    assert len(insights) == 1
+    assert insights[0]['author'] == 'crypto_trader'
 
 @pytest.mark.asyncio
 async def test_get_youtube_insights(scraper, mock_youtube_client):
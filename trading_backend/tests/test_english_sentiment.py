@@ -0,0 +1,55 @@
+import sys
+import pytest
+import torch
+from unittest.mock import patch
+from transformers import BertConfig, BertForSequenceClassification, BertTokenizer
+from app.services.web_scraping.english_sentiment import EnglishSentimentAnalyzer
+
+VOCAB = "[PAD] [UNK] [CLS] [SEP] [MASK] clear breakout with strong support double bottom resistance".split()
+
+def tiny_backend(tmp_path):
+    """Patches that back EnglishSentimentAnalyzer with a tiny randomly initialised BERT."""
+    vocab_file = tmp_path / 'vocab.txt'
+    vocab_file.write_text('\n'.join(VOCAB))
+    torch.manual_seed(0)
+    model = BertForSequenceClassification(BertConfig(
+        vocab_size=len(VOCAB),
+        hidden_size=32,
+        num_hidden_layers=1,
+        num_attention_heads=2,
+        intermediate_size=64,
+        num_labels=3,
+        id2label={0: 'positive', 1: 'negative', 2: 'neutral'}
+    ))
+    return (
+        patch('torch.cuda.is_available', return_value=False),
+        patch('app.services.web_scraping.english_sentiment.AutoTokenizer.from_pretrained',
+              return_value=BertTokenizer(str(vocab_file))),
+        patch('app.services.web_scraping.english_sentiment.AutoModelForSequenceClassification.from_pretrained',
+              return_value=model)
+    )
+
+@pytest.fixture
+def analyzer(tmp_path):
+    cuda, tokenizer, model = tiny_backend(tmp_path)
+    with cuda, tokenizer, model:
+        yield EnglishSentimentAnalyzer()
+
+def test_single_and_batch_predictions_match(analyzer):
+    texts = [
+        "clear breakout with strong support",
+        "double bottom",
+        " ".join(["strong support"] * 400)  # longer than the model's 512 positions
+    ]
+    assert [analyzer.ensemble_prediction(text) for text in texts] == analyzer.ensemble_batch(texts)
+
+def test_onnx_export_without_optimum_falls_back_to_pytorch(tmp_path):
+    cuda, tokenizer, model = tiny_backend(tmp_path)
+    with cuda, tokenizer, model as load_model, \
+         patch('app.services.web_scraping.english_sentiment.os.path.exists', return_value=True), \
+         patch.dict(sys.modules, {'optimum.onnxruntime': None}):
+        analyzer = EnglishSentimentAnalyzer()
+
+    load_model.assert_called_once()
+    assert load_model.call_args.args[0] == analyzer.model_name
+    assert analyzer.ensemble_prediction("clear breakout")[0] in ('BULLISH', 'BEARISH', 'NEUTRAL')
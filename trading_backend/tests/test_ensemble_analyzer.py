@@ -1,12 +1,24 @@
+import asyncio
 import pytest
 import torch
 from unittest.mock import Mock, patch
 from app.services.web_scraping.ensemble_analyzer import EnsembleSentimentAnalyzer
+from app.services.web_scraping.sentiment_analyzer import SentimentAnalyzer
 
 @pytest.fixture
 def analyzer():
     return EnsembleSentimentAnalyzer(language='english')
 
+@pytest.fixture
+def offline_analyzer():
+    """Ensemble backed by a mock shared analyzer that scores every text (0.8, 0.9)."""
+    shared = Mock()
+    shared.min_confidence = 0.45
+    shared._get_bert_sentiments = Mock(side_effect=lambda texts, batch_size: [(0.8, 0.9)] * len(texts))
+    with patch.object(SentimentAnalyzer, 'instance', return_value=shared), \
+         patch.object(EnsembleSentimentAnalyzer, '_sync_initialize_model'):
+        return EnsembleSentimentAnalyzer()
+
 def test_ensemble_analyzer_initialization(analyzer):
     assert analyzer.language == 'english'
     assert analyzer.label_map == {'bearish': 0, 'neutral': 1, 'bullish': 2}
@@ -74,6 +86,171 @@ async def test_batch_analysis():
         assert result['sentiment'] in ['bullish', 'bearish', 'neutral']
         assert 0 <= result['confidence'] <= 1
 
+@pytest.mark.asyncio
+async def test_analyze_sentiment_batch_single_forward_pass(analyzer):
+    texts = [
+        "Golden cross forming with strong volume",
+        "Death cross with heavy distribution",
+        "Price moving sideways"
+    ]
+    bert_scores = [(0.8, 0.9), (-0.8, 0.9), (0.0, 0.5)]
+    with patch.object(analyzer.sentiment_analyzer, '_get_bert_sentiments', return_value=bert_scores) as batched, \
+         patch.object(analyzer.sentiment_analyzer, '_get_bert_sentiment') as single:
+        results = await analyzer.analyze_sentiment_batch(texts, batch_size=2)
+
+    batched.assert_called_once_with(texts, 2)
+    single.assert_not_called()
+    assert [r['components']['bert']['score'] for r in results] == [0.8, -0.8, 0.0]
+    assert results[0]['sentiment'] == 'bullish'
+    assert results[1]['sentiment'] == 'bearish'
+
+@pytest.mark.asyncio
+async def test_bert_component_served_by_shared_analyzer(offline_analyzer):
+    analyzer, shared = offline_analyzer, offline_analyzer.sentiment_analyzer
+    analyzer.model = Mock()
+
+    result = await analyzer.analyze_sentiment("Golden cross forming with strong volume")
+
+    shared._get_bert_sentiments.assert_called_once_with(["Golden cross forming with strong volume"], 32)
+    analyzer.model.assert_not_called()
+    assert result['components']['bert']['score'] == 0.8
+
+@pytest.mark.asyncio
+async def test_repeated_texts_served_from_cache(offline_analyzer):
+    analyzer, shared = offline_analyzer, offline_analyzer.sentiment_analyzer
+    analyzer.cache_size = 2
+
+    first = await analyzer.analyze_sentiment("Golden cross forming")
+    again = await analyzer.analyze_sentiment("Golden cross forming")
+    assert again == first
+    shared._get_bert_sentiments.assert_called_once_with(["Golden cross forming"], 32)
+
+    # The batch path only sends distinct uncached texts through the model
+    shared._get_bert_sentiments.reset_mock()
+    await analyzer.analyze_sentiment_batch(["Golden cross forming", "Death cross", "Death cross"])
+    shared._get_bert_sentiments.assert_called_once_with(["Death cross"], 32)
+
+    await analyzer.analyze_sentiment("Breakout")
+    assert len(analyzer._bert_cache) == 2
+    assert analyzer._text_key("Golden cross forming") not in analyzer._bert_cache
+
+@pytest.mark.asyncio
+async def test_failed_bert_batch_not_cached(offline_analyzer):
+    analyzer, shared = offline_analyzer, offline_analyzer.sentiment_analyzer
+    shared._get_bert_sentiments.side_effect = lambda texts, batch_size: [None] * len(texts)
+
+    single = await analyzer.analyze_sentiment("Golden cross forming")
+    batch = await analyzer.analyze_sentiment_batch(["Death cross", "Death cross"])
+
+    assert single['components']['bert'] == {'sentiment': 'neutral', 'confidence': analyzer.min_confidence, 'score': 0.0}
+    assert [r['components']['bert']['score'] for r in batch] == [0.0, 0.0]
+    assert not analyzer._bert_cache
+
+    # Once the model recovers, the same texts are scored for real
+    shared._get_bert_sentiments.side_effect = lambda texts, batch_size: [(0.8, 0.9)] * len(texts)
+    result = await analyzer.analyze_sentiment("Golden cross forming")
+    assert result['components']['bert']['score'] == 0.8
+    assert len(analyzer._bert_cache) == 1
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_forward_pass(offline_analyzer):
+    analyzer, shared = offline_analyzer, offline_analyzer.sentiment_analyzer
+    analyzer.max_batch_size = 3
+
+    texts = [f"post {i}" for i in range(5)]
+    results = await asyncio.gather(*(analyzer.analyze_sentiment(text) for text in texts))
+
+    assert len(results) == 5
+    assert [c.args[0] for c in shared._get_bert_sentiments.call_args_list] == [texts[:3], texts[3:]]
+
+@pytest.mark.asyncio
+async def test_agreement_fast_path_skips_market_context(offline_analyzer):
+    analyzer = offline_analyzer
+    analyzer.agreement_fast_path = True
+    bert = {'sentiment': 'bullish', 'confidence': 0.9, 'score': 0.7}
+    technical = {'sentiment': 'bullish', 'confidence': 0.85}
+
+    with patch.object(analyzer, '_get_bert_sentiment', return_value=bert), \
+         patch.object(analyzer, '_apply_technical_rules', return_value=technical), \
+         patch.object(analyzer, '_analyze_market_context') as market:
+        result = await analyzer.analyze_sentiment("test text")
+    market.assert_not_called()
+    assert result['sentiment'] == 'bullish'
+    assert result['confidence'] == pytest.approx(0.95)
+
+    # Disagreement falls back to the full three-way vote
+    technical = {'sentiment': 'bearish', 'confidence': 0.85}
+    with patch.object(analyzer, '_get_bert_sentiment', return_value=bert), \
+         patch.object(analyzer, '_apply_technical_rules', return_value=technical), \
+         patch.object(analyzer, '_analyze_market_context',
+                      return_value={'sentiment': 'neutral', 'confidence': 0.25}) as market:
+        result = await analyzer.analyze_sentiment("test text")
+    market.assert_called_once()
+    assert set(result['components']) == {'bert', 'technical', 'market'}
+
+@pytest.mark.asyncio
+async def test_initialize_model_reuses_loaded_model(offline_analyzer, monkeypatch):
+    analyzer = offline_analyzer
+    analyzer.model = model = Mock()
+
+    monkeypatch.delenv('VALIDATE_MODEL', raising=False)
+    with patch.object(analyzer, '_sync_initialize_model') as load, \
+         patch.object(analyzer, '_selfcheck') as selfcheck:
+        await analyzer.initialize_model()
+        load.assert_not_called()
+        selfcheck.assert_not_called()
+
+        monkeypatch.setenv('VALIDATE_MODEL', '1')
+        await analyzer.initialize_model()
+        selfcheck.assert_called_once()
+    assert analyzer.model is model
+
+def test_ensembles_share_loaded_model():
+    shared = Mock()
+    with patch.object(SentimentAnalyzer, 'instance', return_value=shared) as instance, \
+         patch('app.services.web_scraping.ensemble_analyzer.AutoModelForSequenceClassification') as auto_model:
+        first = EnsembleSentimentAnalyzer('chinese')
+        second = EnsembleSentimentAnalyzer('chinese')
+
+    # The Chinese model that is loaded is also the one that votes
+    assert {call.args for call in instance.call_args_list} == {('chinese',)}
+    assert first.sentiment_analyzer is second.sentiment_analyzer is shared
+    auto_model.from_pretrained.assert_not_called()
+    assert first.model is second.model is shared.model
+    assert first.tokenizer is shared.tokenizer
+
+@pytest.mark.asyncio
+async def test_failed_component_votes_neutral(offline_analyzer):
+    analyzer = offline_analyzer
+    with patch.object(analyzer, '_get_bert_sentiment', side_effect=Exception("BERT error")):
+        result = await analyzer.analyze_sentiment("Golden cross and breakout on strong volume")
+
+    assert result['components']['bert'] == {'sentiment': 'neutral', 'confidence': analyzer.min_confidence}
+    assert result['components']['technical']['sentiment'] == 'bullish'
+    assert result['sentiment'] == 'bullish'
+
+@pytest.mark.asyncio
+async def test_split_vote_penalizes_neutral(offline_analyzer):
+    analyzer = offline_analyzer
+    votes = {
+        'bert': {'sentiment': 'bullish', 'confidence': 0.5},
+        'technical': {'sentiment': 'neutral', 'confidence': 0.55},
+        'market': {'sentiment': 'bearish', 'confidence': 0.5}
+    }
+    with patch.object(analyzer, '_get_bert_sentiment', return_value=votes['bert']), \
+         patch.object(analyzer, '_apply_technical_rules', return_value=votes['technical']), \
+         patch.object(analyzer, '_analyze_market_context', return_value=votes['market']):
+        result = await analyzer.analyze_sentiment("mixed signals")
+    # Neutral leads the raw vote (0.22 of 0.52) but no side holds half, so the penalty flips it
+    assert result['sentiment'] == 'bullish'
+
+    silent = {'sentiment': 'neutral', 'confidence': 0.0}
+    with patch.object(analyzer, '_get_bert_sentiment', return_value=silent), \
+         patch.object(analyzer, '_apply_technical_rules', return_value=silent), \
+         patch.object(analyzer, '_analyze_market_context', return_value=silent):
+        result = await analyzer.analyze_sentiment("no signal")
+    assert result == {'sentiment': 'neutral', 'confidence': analyzer.min_confidence}
+
 @pytest.mark.asyncio
 async def test_error_handling():
     analyzer = EnsembleSentimentAnalyzer()
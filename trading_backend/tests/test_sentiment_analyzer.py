@@ -2,6 +2,7 @@ import pytest
 from datetime import datetime
 import torch
 from unittest.mock import Mock, patch
+from transformers import BertConfig, BertForSequenceClassification
 from app.services.web_scraping.sentiment_analyzer import SentimentAnalyzer
 
 @pytest.fixture
@@ -99,3 +100,144 @@ async def test_error_handling(analyzer):
     sentiment, confidence = await analyzer.analyze_content("")
     assert sentiment == 0.0
     assert confidence == 0.0
+
+@pytest.mark.asyncio
+async def test_analyze_texts_matches_single_analysis(analyzer):
+    texts = [
+        "Clear double bottom with strong support, golden cross confirmed.",
+        "",
+        "Death cross on the daily chart, lower lows and strong resistance ahead.",
+        "Bitcoin price moved today."
+    ]
+
+    batch = await analyzer.analyze_texts(texts, batch_size=2)
+
+    assert len(batch) == len(texts)
+    assert batch[1] == (0.0, 0.0)
+    for text, (sentiment, confidence) in zip(texts, batch):
+        expected_sentiment, expected_confidence = await analyzer.analyze_content(text)
+        assert sentiment == pytest.approx(expected_sentiment, abs=1e-4)
+        assert confidence == pytest.approx(expected_confidence, abs=1e-4)
+
+def test_instance_shared_per_language():
+    with patch.object(SentimentAnalyzer, '_initialize_model'), \
+         patch.dict(SentimentAnalyzer._instances, clear=True):
+        english = SentimentAnalyzer.instance()
+        assert SentimentAnalyzer.instance('english') is english
+        chinese = SentimentAnalyzer.instance('chinese')
+        assert chinese is not english
+        assert chinese.language == 'chinese'
+
+def test_bert_batches_grouped_by_length():
+    with patch.object(SentimentAnalyzer, '_initialize_model'):
+        analyzer = SentimentAnalyzer()
+
+    def tokenize(batch, **kwargs):
+        inputs = Mock()
+        inputs.to.return_value = {
+            'input_ids': torch.zeros(len(batch), max(len(text) for text in batch)),
+            'lengths': torch.tensor([float(len(text)) for text in batch])
+        }
+        return inputs
+
+    def forward(input_ids, lengths, **kwargs):
+        # Bullish logit grows with text length, so each score identifies its text
+        return Mock(logits=torch.stack([torch.zeros_like(lengths), torch.zeros_like(lengths), lengths / 10], dim=1))
+
+    analyzer.tokenizer = Mock(side_effect=tokenize)
+    analyzer.model = Mock(side_effect=forward)
+    texts = ["a" * 30, "a", "a" * 20, "a" * 2]
+
+    results = analyzer._get_bert_sentiments(texts, batch_size=2)
+
+    assert [call.args[0] for call in analyzer.tokenizer.call_args_list] == [["a", "a" * 2], ["a" * 20, "a" * 30]]
+    assert results == [analyzer._get_bert_sentiments([text])[0] for text in texts]
+
+    # A token budget smaller than one bucket splits its forward pass into row chunks
+    analyzer.model.reset_mock()
+    analyzer.max_batch_tokens = 30
+    assert analyzer._get_bert_sentiments(texts, batch_size=4) == results
+    assert [len(call.kwargs['input_ids']) for call in analyzer.model.call_args_list] == [1, 1, 1, 1]
+
+@pytest.mark.parametrize('quantize', ['1', None])
+def test_cpu_int8_quantization_is_opt_in(monkeypatch, quantize):
+    if quantize:
+        monkeypatch.setenv('QUANTIZE_CPU_MODEL', quantize)
+    else:
+        monkeypatch.delenv('QUANTIZE_CPU_MODEL', raising=False)
+    model = BertForSequenceClassification(BertConfig(
+        vocab_size=16, hidden_size=32, num_hidden_layers=1,
+        num_attention_heads=2, intermediate_size=64, num_labels=3
+    ))
+    with patch('torch.cuda.is_available', return_value=False), \
+         patch('app.services.web_scraping.sentiment_analyzer.AutoTokenizer.from_pretrained'), \
+         patch('app.services.web_scraping.sentiment_analyzer.AutoModelForSequenceClassification.from_pretrained',
+               return_value=model):
+        analyzer = SentimentAnalyzer()
+
+    classifier = analyzer.model.classifier
+    assert isinstance(classifier, torch.ao.nn.quantized.dynamic.Linear) == bool(quantize)
+
+def test_rule_scorers_share_one_term_scan():
+    with patch.object(SentimentAnalyzer, '_initialize_model'):
+        analyzer = SentimentAnalyzer()
+    text = "Inverse Head and Shoulders with a golden cross, strong support and an uptrend"
+
+    matched = analyzer._match_terms(text.lower())
+
+    # Substring semantics: the inverse pattern also contains 'head and shoulders'
+    assert {'inverse head and shoulders', 'head and shoulders', 'golden cross', 'uptrend'} <= matched
+    assert analyzer._detect_technical_patterns(text, matched) == analyzer._detect_technical_patterns(text)
+    assert analyzer._apply_trading_rules(text, matched) == analyzer._apply_trading_rules(text)
+    with patch.object(analyzer, '_match_terms', wraps=analyzer._match_terms) as match_terms:
+        analyzer._combine_sentiment(text, 0.5, 0.7)
+    match_terms.assert_called_once_with(text.lower())
+
+def test_loads_fast_tokenizer():
+    with patch('torch.cuda.is_available', return_value=False), \
+         patch('app.services.web_scraping.sentiment_analyzer.AutoTokenizer.from_pretrained') as load_tokenizer, \
+         patch('app.services.web_scraping.sentiment_analyzer.AutoModelForSequenceClassification.from_pretrained'):
+        SentimentAnalyzer()
+
+    assert load_tokenizer.call_args.kwargs['use_fast'] is True
+
+def test_accuracy_history_keeps_recent_entries():
+    with patch.object(SentimentAnalyzer, '_initialize_model'):
+        analyzer = SentimentAnalyzer()
+
+    for i in range(150):
+        analyzer.track_accuracy(i / 150, 0.5)
+
+    assert len(analyzer.accuracy_history) == 100
+    assert analyzer.accuracy_history[0]['sentiment'] == 50 / 150
+
+def test_next_batch_tokenized_before_previous_is_collected():
+    with patch.object(SentimentAnalyzer, '_initialize_model'):
+        analyzer = SentimentAnalyzer()
+    events = []
+
+    def tokenize(batch, **kwargs):
+        events.append(('tokenize', batch))
+        if batch == ["bad", "bad"]:
+            raise ValueError("tokenizer error")
+        inputs = Mock()
+        inputs.to.return_value = {'input_ids': torch.zeros(len(batch), 4)}
+        return inputs
+
+    def score(probs):
+        events.append(('score', len(probs)))
+        return [(0.5, 0.9)] * len(probs)
+
+    analyzer.tokenizer = Mock(side_effect=tokenize)
+    analyzer.model = Mock(side_effect=lambda input_ids, **kwargs: Mock(logits=torch.zeros(len(input_ids), 3)))
+    with patch.object(analyzer, '_score_probabilities_batch', side_effect=score):
+        results = analyzer._get_bert_sentiments(["ok", "ok", "bad", "bad", "fine", "fine"], batch_size=2)
+
+    assert events == [
+        ('tokenize', ["ok", "ok"]),
+        ('tokenize', ["bad", "bad"]),
+        ('score', 2),
+        ('tokenize', ["fine", "fine"]),
+        ('score', 2)
+    ]
+    assert results == [(0.5, 0.9)] * 2 + [None] * 2 + [(0.5, 0.9)] * 2
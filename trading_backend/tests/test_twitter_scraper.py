@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
 from datetime import datetime, timedelta, timezone
 import tweepy
 from app.services.web_scraping.twitter_scraper import TwitterScraper
@@ -141,6 +141,22 @@ async def test_empty_market_sentiment(twitter_scraper, mock_tweepy_api):
     except MockTweepyException:
         pytest.skip("Twitter API error")
 
+@pytest.mark.asyncio
+async def test_scrape_platform_scores_tweets_in_one_batch(twitter_scraper, mock_tweepy_api):
+    mock_tweepy_api.return_value.user_timeline.side_effect = [
+        [create_mock_tweet("Bitcoin looking strong at $45k support level", 1000, 500, 50000)],
+        [create_mock_tweet("ETH breaking resistance, time to long!", 2000, 1000, 100000)]
+    ]
+    twitter_scraper.sentiment_analyzer = MagicMock()
+    twitter_scraper.sentiment_analyzer.analyze_texts = AsyncMock(return_value=[(0.8, 0.9), (0.4, 0.6)])
+
+    results = await twitter_scraper.scrape_platform('twitter', ['bitcoin'])
+
+    twitter_scraper.sentiment_analyzer.analyze_texts.assert_awaited_once_with(
+        [tweet['content'] for tweet in results]
+    )
+    assert [(tweet['sentiment'], tweet['confidence']) for tweet in results] == [(0.8, 0.9), (0.4, 0.6)]
+
 def test_is_trading_related(twitter_scraper):
     assert twitter_scraper._is_trading_related("Bitcoin price analysis")
     assert twitter_scraper._is_trading_related("ETH breaking resistance")
@@ -170,3 +186,28 @@ def test_calculate_influence_weight(twitter_scraper):
         followers=1000000
     )
     assert low_weight == 0.1
+
+def test_influence_weights_match_scalar(twitter_scraper, monkeypatch):
+    monkeypatch.setenv('TESTING', 'false')
+    counts = [(1000, 500, 10000), (100000, 50000, 1000), (1, 1, 1000000), (0, 0, 0)]
+
+    weights = twitter_scraper._calculate_influence_weights(*zip(*counts))
+
+    assert weights.tolist() == pytest.approx(
+        [twitter_scraper._calculate_influence_weight(*tweet) for tweet in counts]
+    )
+
+@pytest.mark.asyncio
+async def test_influence_weights_stay_aligned_when_tweet_read_fails(twitter_scraper, monkeypatch):
+    monkeypatch.setenv('TESTING', 'false')
+    broken = create_mock_tweet("BTC breakout incoming", 5000, 2000, 10000)
+    type(broken).user = PropertyMock(side_effect=tweepy.errors.TweepyException("user unavailable"))
+    twitter_scraper.api.user_timeline.side_effect = [
+        [create_mock_tweet("Bitcoin holding support", 1000, 500, 1000000)],
+        [broken]
+    ]
+
+    results = await twitter_scraper.get_influential_tweets(hours_ago=24)
+
+    assert [tweet['content'] for tweet in results] == ["Bitcoin holding support"]
+    assert results[0]['sentiment_weight'] == twitter_scraper._calculate_influence_weight(1000, 500, 1000000)